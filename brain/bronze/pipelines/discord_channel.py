@@ -1,19 +1,28 @@
 import argparse
 import os
 import asyncio
+import sys
+from pathlib import Path
 from dotenv import load_dotenv
-from bronze.extractors.discord_extractor import DiscordExtractor
-from bronze.utils.pipeline import Pipeline
-import sqlalchemy as sa
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+from extractor.discord_extractor import DiscordExtractor
+from utils.pipeline import ConflictTarget, Pipeline
 
 
 
 def main():
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Discord data pipeline')
-    parser.add_argument('--input-path', required=True, help='Path to input file')
-    args = parser.parse_args()
-    
+    parser.parse_args()
+    run()
+
+
+def run() -> int:
+    """Extract and load the guild's text channels; returns the rows written."""
     # Load environment variables
     load_dotenv()
     DARCY_KEY = os.getenv('DARCY_KEY') # Basically an authorised discord client
@@ -25,16 +34,18 @@ def main():
     # DISCORD CHANNELS --------------------------------------------------------------------- */
     discord_channels_extractor = DiscordExtractor(DARCY_KEY, TEST_SERVER_ID)
     discord_channels_pipeline = Pipeline(
-        ddl_filepath = 'create_discord_channels_table.sql',
-        table_name = 'discord_channels',
+        ddl_filepath = 'discord_channel.sql',
+        table_name = 'discord_channel',
+        conflict_targets = [ConflictTarget(['channel_id'])],
     )
 
     # Follows an ETL process
     raw_data = asyncio.run(discord_channels_extractor.fetch_discord_channels()) # Extract
     if discord_channels_extractor.recreate_table:
         discord_channels_pipeline.create_table() # Transform
-    discord_channels_pipeline.ingest_from_df(asyncio.run(discord_channels_extractor.parse_discord_data(raw_data))) # Load
+    stats = discord_channels_pipeline.ingest_from_df(asyncio.run(discord_channels_extractor.parse_discord_data(raw_data))) # Load
     discord_channels_pipeline.test_run_status()
+    return stats["rows_written"]
 
 if __name__ == "__main__":
     main() 
@@ -1,41 +1,116 @@
 import argparse
-import os
 import asyncio
+import os
+import sys
+from pathlib import Path
+
 from dotenv import load_dotenv
-from bronze.extractors.discord_extractor import DiscordExtractor
-from bronze.utils.pipeline import Pipeline
-import sqlalchemy as sa
 
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+from extractor.discord_extractor import (
+    DEFAULT_BATCH_SIZE, DEFAULT_MAX_CONCURRENCY, DiscordExtractor
+)
+from utils.discord_chat_state import (
+    DISCORD_CHAT_CONFLICT_TARGETS, DISCORD_CHAT_UPDATE_COLUMNS, checkpoint_from_json,
+    checkpoint_to_json, load_watermarks, save_watermarks, watermarks_from_json, watermarks_to_json
+)
+from utils.pipeline import Pipeline
+from utils.staging import DEFAULT_STAGING_ROOT, StagingArea
 
 
 def main():
     # Parse command line arguments
     parser = argparse.ArgumentParser(description='Discord data pipeline')
-    parser.add_argument('--input-path', required=True, help='Path to input file')
+    parser.add_argument('--step', choices=['all', 'extract', 'load'], default='all',
+                        help='Extract into the staging directory, load what is staged, or both')
+    parser.add_argument('--staging-dir', type=Path, default=DEFAULT_STAGING_ROOT / 'discord_chat',
+                        help='Directory holding staged batches and their manifest')
+    parser.add_argument('--full', action='store_true',
+                        help='Ignore stored high-water marks and re-fetch the whole history')
+    parser.add_argument('--concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY,
+                        help='Number of channel/thread histories fetched at once')
+    parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                        help='Messages loaded per batch')
+    parser.add_argument('--arrow-strings', action='store_true',
+                        help='Keep message content as Arrow strings (needs pyarrow)')
     args = parser.parse_args()
-    
+    run(args.step, args.staging_dir, args.full, args.concurrency, args.batch_size, args.arrow_strings)
+
+
+def run(step: str = 'all', staging_dir: Path = DEFAULT_STAGING_ROOT / 'discord_chat',
+        full: bool = False, concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        batch_size: int = DEFAULT_BATCH_SIZE, arrow_strings: bool = False) -> int:
+    """Run the extract and/or load step; returns the rows written by the load."""
+    args = argparse.Namespace(full=full, concurrency=concurrency, batch_size=batch_size,
+                              arrow_strings=arrow_strings)
     # Load environment variables
     load_dotenv()
-    bot_key = os.getenv('BOT_KEY') # Basically an authorised discord client
-    server_id = os.getenv('TEST_SERVER_ID') # The server id of the AI server
+    staging = StagingArea(staging_dir)
+
+    if step in ('all', 'extract'):
+        bot_key = os.getenv('BOT_KEY') # Basically an authorised discord client
+        server_id = os.getenv('TEST_SERVER_ID') # The server id of the AI server
+
+        if not bot_key or not server_id:
+            raise ValueError("Bot Key and Server ID must be set in .env file")
+
+        # DISCORD CHAT --------------------------------------------------------------------- */
+        discord_chat_extractor = DiscordExtractor(bot_key, server_id, arrow_strings=args.arrow_strings)
+        asyncio.run(extract(discord_chat_extractor, staging, args))
+
+    if step in ('all', 'load'):
+        return load(staging)
+    return 0
 
-    if not bot_key or not server_id:
-        raise ValueError("Bot Key and Server ID must be set in .env file")
 
-    # DISCORD CHAT --------------------------------------------------------------------- */
-    discord_chat_extractor = DiscordExtractor(bot_key, server_id)
+async def extract(extractor: DiscordExtractor, staging: StagingArea, args: argparse.Namespace) -> None:
+    """Extract and transform one batch at a time, staging each batch with its checkpoint."""
+    if staging.finished:
+        print(f"{staging.directory} holds a finished extraction; run the load step first")
+        return
+
+    resume_from = None
+    if staging.in_progress and staging.checkpoint:
+        resume_from = checkpoint_from_json(staging.checkpoint)
+        print(f"Resuming interrupted extraction: {len(resume_from['completed'])} "
+              f"channels/threads already done")
+    staging.start()
+
+    watermarks = {} if args.full else load_watermarks()
+    print(f"Resuming from {len(watermarks)} channel/thread high-water marks")
+
+    async for batch in extractor.fetch_discord_chat( # Extract
+            watermarks, max_concurrency=args.concurrency, batch_size=args.batch_size,
+            resume_from=resume_from):
+        df = await extractor.parse_discord_data(batch) # Transform
+        # Stage off the event loop so the crawl keeps going meanwhile
+        await asyncio.to_thread(staging.write_batch, df, checkpoint_to_json(extractor.checkpoint))
+
+    print(f"Typing frames saved {extractor.memory_saved / 2**20:.1f} MiB in total")
+    staging.finish({"watermarks": watermarks_to_json(extractor.watermarks)})
+
+
+def load(staging: StagingArea) -> int:
+    """Load every staged batch; once a finished extraction is fully loaded, advance the marks."""
     discord_chat_pipeline = Pipeline(
-        ddl_filepath = 'create_discord_chat_table.sql',
+        ddl_filepath = 'discord_chat.sql',
         table_name = 'discord_chat',
+        conflict_targets = DISCORD_CHAT_CONFLICT_TARGETS,
+        update_columns = DISCORD_CHAT_UPDATE_COLUMNS,
     )
+    discord_chat_pipeline.create_table()
+    for batch in staging.pending_batches():
+        discord_chat_pipeline.ingest_from_df(staging.read_batch(batch)) # Load
+        staging.mark_loaded(batch)
 
-    raw_data = asyncio.run(discord_chat_extractor.fetch_discord_chat()) # Extract
-    if discord_chat_extractor.recreate_table:
-        discord_chat_pipeline.create_table() # Transform                            
-    discord_chat_pipeline.ingest_from_df(asyncio.run(discord_chat_extractor.parse_discord_data(raw_data))) # Load
-    discord_chat_pipeline.test_run_status()
+    if discord_chat_pipeline.test_run_status() and staging.finished:
+        # Only advance the marks once the messages behind them are stored
+        save_watermarks(watermarks_from_json(staging.manifest["result"]["watermarks"]))
+        staging.clear()
+    return sum(run["rows_written"] for run in discord_chat_pipeline.runs if run["status"] == "success")
 
 if __name__ == "__main__":
     main() 
-
-
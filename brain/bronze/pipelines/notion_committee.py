@@ -1,31 +1,75 @@
+import argparse
 import os
 from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.engine import Engine
 from pathlib import Path
-from typing import Optional
 import sys
-# sys.path.append(str(Path(__file__).parent.parent / 'src'))
-# from extractor.notion_extractor import NotionExtractor
-# from utils.pipeline import Pipeline
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.append(str(Path(__file__).parent.parent / 'src'))
+from extractor.notion_extractor import NotionExtractor
+from utils.notion_sync_state import load_watermark, save_watermark
+from utils.pipeline import ConflictTarget, Pipeline
+from utils.staging import DEFAULT_STAGING_ROOT, StagingArea
 
 def main():
+    parser = argparse.ArgumentParser(description='Notion committee pipeline')
+    parser.add_argument('--step', choices=['all', 'extract', 'load'], default='all',
+                        help='Extract into the staging directory, load what is staged, or both')
+    parser.add_argument('--staging-dir', type=Path, default=DEFAULT_STAGING_ROOT / 'notion_committee',
+                        help='Directory holding staged batches and their manifest')
+    parser.add_argument('--full', action='store_true',
+                        help='Ignore the stored watermark and sync every page')
+    args = parser.parse_args()
+    run(args.step, args.staging_dir, args.full)
+
+def run(step: str = 'all', staging_dir: Path = DEFAULT_STAGING_ROOT / 'notion_committee',
+        full: bool = False) -> int:
+    """Run the extract and/or load step; returns the rows written by the load."""
     load_dotenv()
-    NOTION_API_KEY = os.getenv('NOTION_API_KEY')
     NOTION_USERS_DATABASE_ID = os.getenv('NOTION_USERS_DATABASE_ID')
-    notion_extractor = NotionExtractor(NOTION_API_KEY, NOTION_USERS_DATABASE_ID)
+    staging = StagingArea(staging_dir)
+
+    if step in ('all', 'extract'):
+        extract(staging, NOTION_USERS_DATABASE_ID, full)
+    if step in ('all', 'load'):
+        return load(staging, NOTION_USERS_DATABASE_ID)
+    return 0
+
+def extract(staging: StagingArea, database_id: str, full: bool) -> None:
+    if staging.finished:
+        print(f"{staging.directory} holds a finished extraction; run the load step first")
+        return
+    staging.start()
+
+    notion_extractor = NotionExtractor(os.getenv('NOTION_API_KEY'), database_id)
+    watermark = None if full else load_watermark(database_id)
+    print(f"Syncing pages edited since {watermark}" if watermark else "Syncing every page")
+    df = notion_extractor.parse(edited_since=watermark)
+    if not df.empty:
+        staging.write_batch(df)
+    staging.finish({"watermark": df["last_edited_at"].max() if not df.empty else None})
+
+def load(staging: StagingArea, database_id: str) -> int:
     notion_pipeline = Pipeline(
-        ddl_filepath = 'ddl/create_bronze_table.sql',
-        table_name = 'notion_users',
+        ddl_filepath = 'notion_committee.sql',
+        table_name = 'notion_committee',
+        conflict_targets = [ConflictTarget(['notion_id'])],
     )
-    if notion_extractor.recreate_table:
-        notion_pipeline.create_table()
-    notion_pipeline.ingest_from_df(
-        notion_extractor.transform_user_data(
-            notion_extractor.fetch_user_data()
-        )
-    )
-    notion_pipeline.test_run_status() 
+    notion_pipeline.create_table()
+    for batch in staging.pending_batches():
+        notion_pipeline.ingest_from_df(staging.read_batch(batch))
+        staging.mark_loaded(batch)
+
+    if notion_pipeline.test_run_status() and staging.finished:
+        watermark = staging.manifest["result"]["watermark"]
+        if watermark:
+            save_watermark(database_id, watermark)
+        else:
+            print("No committee pages changed")
+        staging.clear()
+    return sum(run["rows_written"] for run in notion_pipeline.runs if run["status"] == "success")
 
 if __name__ == "__main__":
     main()
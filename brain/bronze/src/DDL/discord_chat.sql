@@ -16,16 +16,16 @@ CREATE TABLE IF NOT EXISTS bronze.discord_chat (
 );
 
 -- Create indexes for common query patterns
-CREATE INDEX IF NOT EXISTS idx_discord_chat_channel_id ON bronze.discord_chat_table(channel_id);
-CREATE INDEX IF NOT EXISTS idx_discord_chat_thread_id ON bronze.discord_chat_table(thread_id);
-CREATE INDEX IF NOT EXISTS idx_discord_chat_author_id ON bronze.discord_chat_table(author_id);
-CREATE INDEX IF NOT EXISTS idx_discord_chat_chat_created_at ON bronze.discord_chat_table(chat_created_at);
+CREATE INDEX IF NOT EXISTS idx_discord_chat_channel_id ON bronze.discord_chat(channel_id);
+CREATE INDEX IF NOT EXISTS idx_discord_chat_thread_id ON bronze.discord_chat(thread_id);
+CREATE INDEX IF NOT EXISTS idx_discord_chat_discord_user_id ON bronze.discord_chat(discord_user_id);
+CREATE INDEX IF NOT EXISTS idx_discord_chat_chat_created_at ON bronze.discord_chat(chat_created_at);
 
 -- Add a unique constraint to prevent duplicate messages
 CREATE UNIQUE INDEX IF NOT EXISTS idx_discord_chat_unique_message 
-ON bronze.discord_chat_table(channel_id, message_id, thread_id) 
+ON bronze.discord_chat(channel_id, message_id, thread_id) 
 WHERE thread_id IS NOT NULL;
 
 CREATE UNIQUE INDEX IF NOT EXISTS idx_discord_chat_unique_channel_message 
-ON bronze.discord_chat_table(channel_id, message_id) 
+ON bronze.discord_chat(channel_id, message_id) 
 WHERE thread_id IS NULL; 
\ No newline at end of file
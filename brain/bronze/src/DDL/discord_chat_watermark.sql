@@ -0,0 +1,9 @@
+-- High-water marks for incremental Discord chat extraction.
+-- One row per channel (thread_id 0) and per thread: the newest message_id ingested.
+CREATE TABLE IF NOT EXISTS bronze.discord_chat_watermark (
+    channel_id BIGINT NOT NULL,
+    thread_id BIGINT NOT NULL DEFAULT 0,
+    last_message_id BIGINT NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (channel_id, thread_id)
+);
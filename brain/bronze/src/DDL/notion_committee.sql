@@ -0,0 +1,28 @@
+-- Create a table for storing Notion Committee database pages
+CREATE TABLE IF NOT EXISTS bronze.notion_committee (
+    notion_id TEXT PRIMARY KEY,
+    name TEXT,
+    role TEXT,
+    status TEXT,
+    team TEXT,
+    joined TEXT,
+    bio TEXT,
+    email TEXT,
+    discord_tag TEXT,
+    facebook TEXT,
+    instagram TEXT,
+    linkedin TEXT,
+    working_on TEXT,
+    workload TEXT,
+    last_edited_at TIMESTAMPTZ NOT NULL,
+    ingestion_timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_notion_committee_last_edited_at ON bronze.notion_committee(last_edited_at);
+
+-- Last Notion last_edited_time synced per source database
+CREATE TABLE IF NOT EXISTS bronze.notion_sync_watermark (
+    database_id TEXT PRIMARY KEY,
+    last_edited_at TIMESTAMPTZ NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
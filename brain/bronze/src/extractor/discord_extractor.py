@@ -1,33 +1,74 @@
+import asyncio
 import os
 import ssl
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+import time
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
 
 import pandas as pd
-from discord import Client, Intents, TextChannel
+from discord import Client, Intents, Message, Object, TextChannel, Thread
+from discord.utils import snowflake_time, time_snowflake
 from dotenv import load_dotenv
 
+from utils.typed_frames import DISCORD_SCHEMA, apply_schema, format_memory_report
+
+# Key of a per-channel (thread_id 0) or per-thread high-water mark
+WatermarkKey = Tuple[int, int]
+# Progress of a chat extraction: {"cursors": {key: last message_id}, "completed": {key, ...}}
+ChatCheckpoint = Dict[str, Any]
+
+# Messages edited this long before the high-water mark are re-fetched on an
+# incremental run so their edits are merged too
+DEFAULT_EDIT_LOOKBACK = timedelta(days=1)
+
+# Channel and thread histories fetched at the same time
+DEFAULT_MAX_CONCURRENCY = 4
+# Long histories log a progress line every this many messages
+PROGRESS_EVERY_MESSAGES = 1000
+# Records per batch yielded by fetch_discord_chat
+DEFAULT_BATCH_SIZE = 5000
+# Full batches allowed to wait for the consumer before the crawl pauses
+MAX_PENDING_BATCHES = 2
+
+
 class DiscordExtractor:
     """
     Discord data extractor that:
     - Fetches channel information
-    - Fetches all messages and threads
+    - Fetches all messages and threads, or only those after stored high-water marks
     - Returns data as pandas DataFrames
     """
     
-    def __init__(self):
-        """Initialize the Discord extractor with configuration and environment variables."""
+    def __init__(self, token: Optional[str] = None, guild_id: Optional[str] = None,
+                 arrow_strings: bool = False):
+        """
+        Initialize the Discord extractor with configuration and environment variables.
+
+        Args:
+            token (str): Discord bot token (defaults to BOT_KEY in .env)
+            guild_id (str): Discord server ID (defaults to TEST_SERVER_ID in .env)
+            arrow_strings (bool): Store message content as string[pyarrow] (needs pyarrow)
+        """
         # Disable SSL verification
         ssl._create_default_https_context = ssl._create_unverified_context
         
         # Load environment variables
         load_dotenv()
-        self.token = os.getenv("BOT_KEY")
-        self.guild_id = int(os.getenv("TEST_SERVER_ID", "0"))
+        self.token = token or os.getenv("BOT_KEY")
+        self.guild_id = int(guild_id or os.getenv("TEST_SERVER_ID", "0"))
         
         if not self.token or not self.guild_id:
             raise ValueError("BOT_KEY and TEST_SERVER_ID must be set in .env file")
         
+        self.recreate_table = False
+        self.logger = None
+        self.arrow_strings = arrow_strings
+        # Bytes saved by typing every frame parse_discord_data returned so far
+        self.memory_saved = 0
+        # Highest message_id seen per (channel_id, thread_id) by the last fetch_discord_chat
+        self.watermarks: Dict[WatermarkKey, int] = {}
+        # Progress covered by the batch fetch_discord_chat last yielded
+        self.checkpoint: Optional[ChatCheckpoint] = None
 
         # Configure intents
         self.intents = Intents.default()
@@ -71,76 +112,204 @@ class DiscordExtractor:
         await client.start(self.token)
         return channels_data
     
+    @staticmethod
+    def _message_record(channel: TextChannel, thread: Optional[Thread], message: Message) -> Dict[str, Any]:
+        return {
+            "channel_id": channel.id,
+            "channel_name": channel.name,
+            "thread_name": thread.name if thread else None,
+            "thread_id": thread.id if thread else None,
+            "message_id": message.id,
+            "discord_username": str(message.author),        # The user's display name
+            "discord_user_id": message.author.id,           # The user's unique ID
+            "content": message.content,
+            "chat_created_at": message.created_at.isoformat(),
+            "chat_edited_at": message.edited_at.isoformat() if message.edited_at else None,
+            "is_thread": thread is not None
+        }
+
+    @staticmethod
+    def _history_after(watermark: Optional[int], edit_lookback: timedelta) -> Optional[Object]:
+        """Snowflake to fetch history after: the watermark minus the edit lookback window."""
+        if watermark is None:
+            return None
+        resume_from = snowflake_time(watermark) - edit_lookback
+        return Object(id=time_snowflake(resume_from))
+
     # Extract
-    async def fetch_discord_chat(self) -> List[Dict[str, Any]]:
-        """Fetch all messages and threads and return as list of dictionaries."""
+    async def fetch_discord_chat(
+        self,
+        watermarks: Optional[Dict[WatermarkKey, int]] = None,
+        edit_lookback: timedelta = DEFAULT_EDIT_LOOKBACK,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        resume_from: Optional[ChatCheckpoint] = None,
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Fetch messages and threads, yielding them in batches of up to batch_size records.
+
+        Channels and threads are crawled concurrently, at most max_concurrency
+        histories at a time. discord.py already serializes requests per rate-limit
+        bucket and sleeps when its headers report the bucket exhausted, so the
+        limit only caps how many buckets are in flight at once.
+
+        At most MAX_PENDING_BATCHES full batches wait for the consumer; when they
+        are not consumed the crawl pauses, so memory stays bounded however long
+        the history is.
+
+        Args:
+            watermarks: Last ingested message_id per (channel_id, thread_id), with
+                thread_id 0 for the channel itself. Channels and threads with a
+                watermark are fetched incrementally; without watermarks the whole
+                history is fetched.
+            edit_lookback: How far before each watermark to re-fetch so recent
+                edits are picked up
+            max_concurrency: Maximum number of channel/thread histories fetched at once
+            batch_size: Number of records per yielded batch
+            resume_from: Checkpoint of an interrupted run. Its completed channels
+                and threads are skipped and the others continue right after their
+                cursor, without the edit lookback.
+
+        While a batch is being consumed, self.checkpoint holds the progress that
+        batch completes: every record behind it is in that batch or an earlier
+        one, so a consumer that stores both can resume from there.
+        Once the generator is exhausted, self.watermarks holds the new high-water marks.
+        """
+        watermarks = watermarks or {}
+        resume_from = resume_from or {"cursors": {}, "completed": set()}
         client = self.create_client()
-        messages_data = []
-        
-        @client.event
-        async def on_ready():
+        # Newest message_id emitted per channel/thread by this run (and the run resumed)
+        cursors: Dict[WatermarkKey, int] = dict(resume_from["cursors"])
+        completed = set(resume_from["completed"])
+        semaphore = asyncio.Semaphore(max_concurrency)
+        ready = asyncio.Event()
+        batches: asyncio.Queue[Optional[Tuple[List[Dict[str, Any]], ChatCheckpoint]]] = asyncio.Queue(
+            maxsize=MAX_PENDING_BATCHES
+        )
+        buffer: List[Dict[str, Any]] = []
+        total = 0
+
+        async def flush() -> None:
+            nonlocal buffer
+            # Snapshot progress as the buffer is swapped out: nothing emitted so
+            # far is left outside this batch and the ones before it
+            batch, buffer = buffer, []
+            checkpoint = {"cursors": dict(cursors), "completed": set(completed)}
+            await batches.put((batch, checkpoint))
+
+        async def emit(record: Dict[str, Any]) -> None:
+            nonlocal total
+            buffer.append(record)
+            total += 1
+            if len(buffer) >= batch_size:
+                await flush()
+
+        async def fetch_history(channel: TextChannel, thread: Optional[Thread]) -> None:
+            key = (channel.id, thread.id if thread else 0)
+            source = thread or channel
+            label = f"#{channel.name}" + (f" / {thread.name}" if thread else "")
+            if key in completed:
+                return
+            if key in cursors:
+                after = Object(id=cursors[key])
+            else:
+                after = self._history_after(watermarks.get(key), edit_lookback)
+            count = 0
+            async with semaphore:
+                start = time.perf_counter()
+                async for message in source.history(limit=None, after=after, oldest_first=True):
+                    # Advance the cursor first so it is captured with the batch holding this record
+                    cursors[key] = max(cursors.get(key, 0), message.id)
+                    await emit(self._message_record(channel, thread, message))
+                    count += 1
+                    if count % PROGRESS_EVERY_MESSAGES == 0:
+                        print(f"  {label}: {count} messages so far")
+                elapsed = time.perf_counter() - start
+            completed.add(key)
+            print(f"Fetched {count} messages from {label} in {elapsed:.1f}s "
+                  f"({count / elapsed if elapsed else 0:.0f} msg/s)")
+
+        async def crawl_channel(channel: TextChannel) -> None:
+            # Fetch channel messages
+            await fetch_history(channel, None)
+
+            # Fetch and process threads
+            async with semaphore:
+                threads = [t async for t in channel.archived_threads(limit=None)]
+            active_threads = channel.threads
+
+            pending = []
+            for thread in [*threads, *active_threads]:
+                watermark = max(watermarks.get((channel.id, thread.id), 0),
+                                cursors.get((channel.id, thread.id), 0)) or None
+                if watermark is not None and (thread.last_message_id or 0) <= watermark:
+                    # Nothing posted since the last run
+                    continue
+                pending.append(fetch_history(channel, thread))
+            await asyncio.gather(*pending)
+
+        async def crawl() -> None:
             try:
-                print("Fetching chat history...")
+                await ready.wait()
+                if client_task.done():
+                    # Surface the login/connection error instead of a missing guild
+                    client_task.result()
+                print(f"Fetching chat history ({max_concurrency} concurrent requests)...")
                 guild = client.get_guild(self.guild_id)
                 if not guild:
                     raise ValueError(f"Guild with ID {self.guild_id} not found")
-                
-                for channel in guild.text_channels:
-                    print(f"Processing channel: {channel.name}")
-                    
-                    # Fetch channel messages
-                    async for message in channel.history(limit=None):
-                        messages_data.append({
-                            "channel_id": channel.id,
-                            "channel_name": channel.name,
-                            "thread_name": None,
-                            "thread_id": None,
-                            "message_id": message.id,
-                            "discord_username": str(message.author),        # The user's display name
-                            "discord_user_id": message.author.id,           # The user's unique ID
-                            "content": message.content,
-                            "chat_created_at": message.created_at.isoformat(),
-                            "chat_edited_at": message.edited_at.isoformat() if message.edited_at else None,
-                            "is_thread": False
-                        })
-                    
-                    # Fetch and process threads
-                    threads = [t async for t in channel.archived_threads(limit=None)]
-                    active_threads = channel.threads
-                    
-                    for thread in [*threads, *active_threads]:
-                        print(f"Processing thread: {thread.name}")
-                        async for message in thread.history(limit=None):
-                            messages_data.append({
-                                "channel_id": channel.id,
-                                "channel_name": channel.name,
-                                "thread_name": thread.name,
-                                "thread_id": thread.id,
-                                "message_id": message.id,
-                                "discord_username": str(message.author),        # The user's display name
-                                "discord_user_id": message.author.id,           # The user's unique ID
-                                "content": message.content,
-                                "chat_created_at": message.created_at.isoformat(),
-                                "chat_edited_at": message.edited_at.isoformat() if message.edited_at else None,
-                                "is_thread": True
-                            })
-                
-                print("Chat history fetch completed successfully")
-                
+
+                start = time.perf_counter()
+                await asyncio.gather(*(crawl_channel(channel) for channel in guild.text_channels))
+                if buffer:
+                    await flush()
+                elapsed = time.perf_counter() - start
+
+                print(f"Chat history fetch completed successfully: {total} messages "
+                      f"in {elapsed:.1f}s ({total / elapsed if elapsed else 0:.0f} msg/s)")
+                await batches.put(None)
+            except asyncio.CancelledError:
+                # The consumer stopped early; nobody is waiting for the end marker
+                raise
             except Exception as e:
                 print(f"Error fetching chat history: {str(e)}")
+                await batches.put(None)
                 raise
-            finally:
-                await client.close()
-        
-        await client.start(self.token)
-        return messages_data
+
+        @client.event
+        async def on_ready():
+            ready.set()
+
+        client_task = asyncio.create_task(client.start(self.token))
+        crawl_task = asyncio.create_task(crawl())
+        # A login failure ends client_task before on_ready ever fires
+        client_task.add_done_callback(lambda _: ready.set())
+        try:
+            while (item := await batches.get()) is not None:
+                batch, self.checkpoint = item
+                yield batch
+            await crawl_task
+            self.watermarks = {
+                key: max(watermarks.get(key, 0), cursors.get(key, 0))
+                for key in {*watermarks, *cursors}
+            }
+        finally:
+            crawl_task.cancel()
+            await client.close()
+            await asyncio.gather(client_task, crawl_task, return_exceptions=True)
     
     # Transform
     async def parse_discord_data(self, raw_data: List[Dict[str, Any]]) -> pd.DataFrame:
-        """Transform raw Discord data into a DataFrame."""
+        """Transform raw Discord data into a DataFrame typed by DISCORD_SCHEMA."""
         try:
-            return pd.DataFrame(raw_data)
+            # object dtype keeps snowflake ids exact until apply_schema types them;
+            # a float64 column (ids mixed with None) cannot represent them
+            df, memory = apply_schema(
+                pd.DataFrame(raw_data, dtype=object), DISCORD_SCHEMA, self.arrow_strings
+            )
+            self.memory_saved += memory["bytes_before"] - memory["bytes_after"]
+            print(f"Typed {len(df)} Discord rows: {format_memory_report(memory)}")
+            return df
         except Exception as e:
             if self.logger:
                 self.logger.error(f"Error transforming Discord data: {str(e)}")
@@ -1,10 +1,21 @@
+import json
 import os
-from typing import List, Dict, Any, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Optional
 
 import pandas as pd
 from notion_client import Client
 from dotenv import load_dotenv
 
+# Maximum page size of a Notion database query
+NOTION_PAGE_SIZE = 100
+# Related pages resolved at the same time; Notion allows about 3 requests/s
+RELATION_FETCH_WORKERS = 3
+# Titles in the on-disk cache older than this are fetched again
+RELATION_CACHE_TTL_SECONDS = 24 * 60 * 60
+
 class NotionExtractor:
     """
     Notion data extractor that:
@@ -13,13 +24,15 @@ class NotionExtractor:
     - Returns the processed data
     """
     
-    def __init__(self, api_key: str, database_id: str):
+    def __init__(self, api_key: str, database_id: str, relation_cache_path: Optional[str] = None):
         """
         Initialize NotionExtractor with API key and database ID.
         
         Args:
             api_key (str): Notion API key
             database_id (str): Notion database ID
+            relation_cache_path (str): Optional JSON file persisting related page
+                titles between runs (defaults to NOTION_RELATION_CACHE_PATH in .env)
         """
         if not api_key:
             raise ValueError("A Notion API Key must be provided in .env file")
@@ -32,46 +45,129 @@ class NotionExtractor:
         # Initialize Notion client
         self.client = Client(auth=self.token)
         self.logger = None
+
+        # Titles of related pages (e.g. teams) by page id, shared by every
+        # record of the run so each related page is retrieved once (None when
+        # the retrieval failed)
+        self.relation_titles: Dict[str, Optional[str]] = {}
+        self._relation_fetched_at: Dict[str, float] = {}
+        cache_path = relation_cache_path or os.getenv("NOTION_RELATION_CACHE_PATH")
+        self.relation_cache_path = Path(cache_path) if cache_path else None
+        self._load_relation_cache()
     
-    def fetch_user_data(self) -> List[Dict[str, Any]]:
+    def fetch_user_data(self, edited_since: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         Fetch raw pages from the Notion Committee database with pagination.
+
+        Args:
+            edited_since (str): ISO timestamp; when given only pages edited on or
+                after it are fetched, otherwise the whole database is
         """
-        results: List[Dict[str, Any]] = []
+        pages: List[Dict[str, Any]] = []
         has_more = True
         start_cursor: Optional[str] = None
+        query: Dict[str, Any] = {"database_id": self.database_id, "page_size": NOTION_PAGE_SIZE}
+        if edited_since:
+            query["filter"] = {
+                "timestamp": "last_edited_time",
+                "last_edited_time": {"on_or_after": edited_since},
+            }
 
         while has_more:
-            response = self.client.databases.query(
-                database_id=self.database_id,
-                page_size=77,
-                start_cursor=start_cursor
-            )
-
-            for page in response.get("results", []):
-                props = page.get("properties", {})
-                record = {
-                    "name": self._get_property_value(props.get("Name"), "title"),
-                    "role": self._get_property_value(props.get("Role"), "multi_select"),
-                    "status": self._get_property_value(props.get("Status"), "rich_text"),
-                    "team": self._get_property_value(props.get("Team"), "relation"),
-                    "joined": self._get_property_value(props.get("Joined"), "select"),
-                    "bio": self._get_property_value(props.get("Bio"), "rich_text"),
-                    "email": self._get_property_value(props.get("Email (dscubed)"), "email"),
-                    "discord_tag": self._get_property_value(props.get("Discord Tag"), "rich_text"),
-                    "facebook": self._get_property_value(props.get("Facebook"), "url"),
-                    "instagram": self._get_property_value(props.get("Instagram"), "url"),
-                    "linkedin": self._get_property_value(props.get("LinkedIn"), "url"),
-                    "working_on": self._get_property_value(props.get("I'm Working On"), "rich_text"),
-                    "workload": self._get_property_value(props.get("My Workload Is"), "select"),
-                    "last_edited_at": page.get("last_edited_time")
-                }
-                results.append(record)
+            response = self.client.databases.query(**query, start_cursor=start_cursor)
 
+            pages.extend(response.get("results", []))
             has_more = response.get("has_more", False)
             start_cursor = response.get("next_cursor")
 
-        return results
+        # Resolve every related page once, concurrently, before building records
+        self._resolve_relation_titles(
+            rel["id"]
+            for page in pages
+            for prop in page.get("properties", {}).values()
+            if prop.get("type") == "relation"
+            for rel in prop.get("relation", [])
+            if rel.get("id")
+        )
+        return [self._page_record(page) for page in pages]
+
+    def _page_record(self, page: Dict[str, Any]) -> Dict[str, Any]:
+        props = page.get("properties", {})
+        return {
+            "notion_id": page.get("id"),
+            "name": self._get_property_value(props.get("Name"), "title"),
+            "role": self._get_property_value(props.get("Role"), "multi_select"),
+            "status": self._get_property_value(props.get("Status"), "rich_text"),
+            "team": self._get_property_value(props.get("Team"), "relation"),
+            "joined": self._get_property_value(props.get("Joined"), "select"),
+            "bio": self._get_property_value(props.get("Bio"), "rich_text"),
+            "email": self._get_property_value(props.get("Email (dscubed)"), "email"),
+            "discord_tag": self._get_property_value(props.get("Discord Tag"), "rich_text"),
+            "facebook": self._get_property_value(props.get("Facebook"), "url"),
+            "instagram": self._get_property_value(props.get("Instagram"), "url"),
+            "linkedin": self._get_property_value(props.get("LinkedIn"), "url"),
+            "working_on": self._get_property_value(props.get("I'm Working On"), "rich_text"),
+            "workload": self._get_property_value(props.get("My Workload Is"), "select"),
+            "last_edited_at": page.get("last_edited_time")
+        }
+
+    def _load_relation_cache(self) -> None:
+        """Seed relation_titles from the on-disk cache, skipping expired entries."""
+        if not self.relation_cache_path or not self.relation_cache_path.exists():
+            return
+        try:
+            entries = json.loads(self.relation_cache_path.read_text())
+        except (OSError, ValueError) as e:
+            if self.logger:
+                self.logger.error(f"Ignoring unreadable relation cache {self.relation_cache_path}: {e}")
+            return
+        now = time.time()
+        for page_id, entry in entries.items():
+            if now - entry.get("fetched_at", 0) < RELATION_CACHE_TTL_SECONDS:
+                self.relation_titles[page_id] = entry.get("title", "")
+                self._relation_fetched_at[page_id] = entry["fetched_at"]
+
+    def _save_relation_cache(self) -> None:
+        if not self.relation_cache_path:
+            return
+        entries = {
+            page_id: {"title": title, "fetched_at": self._relation_fetched_at[page_id]}
+            for page_id, title in self.relation_titles.items()
+            if title is not None
+        }
+        self.relation_cache_path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so an interrupted run never leaves a truncated cache
+        temp_path = self.relation_cache_path.with_suffix(self.relation_cache_path.suffix + ".tmp")
+        temp_path.write_text(json.dumps(entries, indent=2))
+        temp_path.replace(self.relation_cache_path)
+
+    def _fetch_page_title(self, page_id: str) -> Optional[str]:
+        """Retrieve a related page's title; None when it could not be retrieved."""
+        try:
+            page = self.client.pages.retrieve(page_id=page_id)
+        except Exception as e:
+            if self.logger:
+                self.logger.error(f"Failed to retrieve related page {page_id}: {e}")
+            return None
+        title_prop = page.get("properties", {}).get("Name", {})
+        if title_prop.get("title"):
+            return title_prop["title"][0].get("plain_text", "")
+        return ""
+
+    def _resolve_relation_titles(self, page_ids: Iterable[str]) -> None:
+        """Retrieve the titles of every page id not already cached, concurrently."""
+        missing = list(dict.fromkeys(p for p in page_ids if p not in self.relation_titles))
+        if not missing:
+            return
+        with ThreadPoolExecutor(max_workers=RELATION_FETCH_WORKERS) as executor:
+            for page_id, title in zip(missing, executor.map(self._fetch_page_title, missing)):
+                # A failed retrieval is cached as None for the rest of this run, so
+                # every record relating to it does not retry it; it is not written
+                # to the disk cache, so the next run retries it
+                self.relation_titles[page_id] = title
+                if title is not None:
+                    self._relation_fetched_at[page_id] = time.time()
+        self._save_relation_cache()
     
     def _get_property_value(self, prop: Dict[str, Any], prop_type: str) -> Any:
         """
@@ -108,14 +204,10 @@ class NotionExtractor:
                     page_id = rel.get("id")
                     if not page_id:
                         continue
-                    try:
-                        page = self.client.pages.retrieve(page_id=page_id)
-                        title_prop = page.get("properties", {}).get("Name", {})
-                        if title_prop.get("title"):
-                            names.append(title_prop["title"][0].get("plain_text", ""))
-                    except Exception as e:
-                        if self.logger:
-                            self.logger.error(f"Failed to retrieve related page {page_id}: {e}")
+                    if page_id not in self.relation_titles:
+                        self._resolve_relation_titles([page_id])
+                    if self.relation_titles.get(page_id):
+                        names.append(self.relation_titles[page_id])
                 return ", ".join(names)
 
         except Exception as e:
@@ -128,18 +220,21 @@ class NotionExtractor:
         """
         Convert raw record list into a DataFrame with metadata.
         """
-        df = pd.DataFrame(raw_data)
         keep = [
-            "name", "role", "status", "team", "joined", "bio",
+            "notion_id", "name", "role", "status", "team", "joined", "bio",
             "email", "discord_tag", "facebook", "instagram", "linkedin",
-            "working_on", "workload", "last_edited_time"
+            "working_on", "workload", "last_edited_at"
         ]
-        df = df[keep]
+        df = pd.DataFrame(raw_data, columns=keep)
         return df
     
-    def parse(self, input_path: Optional[str] = None) -> pd.DataFrame:
+    def parse(self, input_path: Optional[str] = None, edited_since: Optional[str] = None) -> pd.DataFrame:
         """
         Fetch and transform data into a single DataFrame.
+
+        Args:
+            input_path (str): Unused, kept for the extractor interface
+            edited_since (str): Only fetch pages edited on or after this ISO timestamp
         """
-        raw = self.fetch_data()
-        return self.transform_data(raw)
+        raw = self.fetch_user_data(edited_since)
+        return self.transform_user_data(raw)
@@ -0,0 +1,113 @@
+"""
+State and merge helpers for incremental Discord chat extraction.
+
+The watermarks in bronze.discord_chat_watermark record the newest message_id
+ingested per channel and thread, so a run only asks Discord for newer messages.
+Fetched messages are merged into bronze.discord_chat on its unique message
+indexes (see DISCORD_CHAT_CONFLICT_TARGETS): new messages are inserted,
+re-fetched ones get their edits applied.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import text
+
+from custom_tools.brain.postgres.postgres import DatabaseEngine
+from utils.pipeline import ConflictTarget
+
+WatermarkKey = Tuple[int, int]
+
+# bronze.discord_chat has one partial unique index for thread messages and one
+# for channel messages; each fetched message is merged through the matching one
+DISCORD_CHAT_CONFLICT_TARGETS: List[ConflictTarget] = [
+    ConflictTarget(["channel_id", "message_id", "thread_id"], "thread_id IS NOT NULL"),
+    ConflictTarget(["channel_id", "message_id"], "thread_id IS NULL"),
+]
+# Re-fetched messages only carry edits (and renames) worth applying
+DISCORD_CHAT_UPDATE_COLUMNS: List[str] = [
+    "channel_name",
+    "thread_name",
+    "discord_username",
+    "content",
+    "chat_edited_at",
+]
+
+
+def load_watermarks() -> Dict[WatermarkKey, int]:
+    """Return the stored high-water marks keyed by (channel_id, thread_id)."""
+    engine = DatabaseEngine.get_engine()
+    with engine.connect() as conn:
+        result = conn.execute(
+            text(
+                """
+                SELECT channel_id, thread_id, last_message_id
+                FROM bronze.discord_chat_watermark
+                """
+            )
+        )
+        return {
+            (row.channel_id, row.thread_id): row.last_message_id for row in result
+        }
+
+
+def save_watermarks(watermarks: Dict[WatermarkKey, int]) -> None:
+    """Store high-water marks, never moving an existing mark backwards."""
+    if not watermarks:
+        return
+    engine = DatabaseEngine.get_engine()
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                INSERT INTO bronze.discord_chat_watermark (channel_id, thread_id, last_message_id)
+                VALUES (:channel_id, :thread_id, :last_message_id)
+                ON CONFLICT (channel_id, thread_id)
+                DO UPDATE SET
+                    last_message_id = GREATEST(
+                        bronze.discord_chat_watermark.last_message_id,
+                        EXCLUDED.last_message_id
+                    ),
+                    updated_at = CURRENT_TIMESTAMP
+                """
+            ),
+            [
+                {
+                    "channel_id": channel_id,
+                    "thread_id": thread_id,
+                    "last_message_id": last_message_id,
+                }
+                for (channel_id, thread_id), last_message_id in watermarks.items()
+            ],
+        )
+
+
+def _key_to_str(key: WatermarkKey) -> str:
+    return f"{key[0]}:{key[1]}"
+
+
+def _key_from_str(value: str) -> WatermarkKey:
+    channel_id, thread_id = value.split(":")
+    return int(channel_id), int(thread_id)
+
+
+def checkpoint_to_json(checkpoint: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a DiscordExtractor checkpoint into a JSON-serializable dict."""
+    return {
+        "cursors": watermarks_to_json(checkpoint["cursors"]),
+        "completed": sorted(_key_to_str(key) for key in checkpoint["completed"]),
+    }
+
+
+def checkpoint_from_json(data: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "cursors": watermarks_from_json(data["cursors"]),
+        "completed": {_key_from_str(key) for key in data["completed"]},
+    }
+
+
+def watermarks_to_json(watermarks: Dict[WatermarkKey, int]) -> Dict[str, int]:
+    return {_key_to_str(key): message_id for key, message_id in watermarks.items()}
+
+
+def watermarks_from_json(data: Dict[str, int]) -> Dict[WatermarkKey, int]:
+    return {_key_from_str(key): message_id for key, message_id in data.items()}
@@ -0,0 +1,53 @@
+"""
+Watermarks for incremental Notion database syncs.
+
+bronze.notion_sync_watermark keeps the newest last_edited_time synced per Notion
+database, so a run only queries pages edited on or after it. Notion rounds
+last_edited_time to the minute, so the boundary minute is fetched again and
+merged idempotently by the loader.
+"""
+
+from typing import Optional
+
+from sqlalchemy import text
+
+from custom_tools.brain.postgres.postgres import DatabaseEngine
+
+
+def load_watermark(database_id: str) -> Optional[str]:
+    """Return the stored watermark as an ISO timestamp, or None before the first sync."""
+    engine = DatabaseEngine.get_engine()
+    with engine.connect() as conn:
+        watermark = conn.execute(
+            text(
+                """
+                SELECT last_edited_at
+                FROM bronze.notion_sync_watermark
+                WHERE database_id = :database_id
+                """
+            ),
+            {"database_id": database_id},
+        ).scalar()
+    return watermark.isoformat() if watermark else None
+
+
+def save_watermark(database_id: str, last_edited_at: str) -> None:
+    """Store a watermark, never moving an existing one backwards."""
+    engine = DatabaseEngine.get_engine()
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                """
+                INSERT INTO bronze.notion_sync_watermark (database_id, last_edited_at)
+                VALUES (:database_id, :last_edited_at)
+                ON CONFLICT (database_id)
+                DO UPDATE SET
+                    last_edited_at = GREATEST(
+                        bronze.notion_sync_watermark.last_edited_at,
+                        EXCLUDED.last_edited_at
+                    ),
+                    updated_at = CURRENT_TIMESTAMP
+                """
+            ),
+            {"database_id": database_id, "last_edited_at": last_edited_at},
+        )
@@ -0,0 +1,215 @@
+"""
+Bronze loader: bulk loads DataFrames into bronze tables.
+
+Each load streams the rows with COPY into a temporary staging table shaped like
+the target, then merges them into the target with one INSERT ... SELECT. With
+conflict targets set the merge is an upsert (ON CONFLICT ... DO UPDATE, or DO
+NOTHING when there is nothing to update) in which the last staged of several
+rows with the same key wins; without them rows are appended.
+"""
+
+import csv
+import io
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import pandas as pd
+from sqlalchemy.engine import Engine
+
+from custom_tools.brain.postgres.postgres import DatabaseEngine
+
+DDL_DIRECTORY = Path(__file__).resolve().parent.parent / "DDL"
+STAGE_ORDINAL_COLUMN = "pipeline_stage_ordinal"
+
+
+@dataclass(frozen=True)
+class ConflictTarget:
+    """
+    A unique index rows are merged on.
+
+    For a partial unique index, where must repeat the index predicate; only
+    staged rows matching it are merged through this target.
+    """
+
+    columns: List[str]
+    where: Optional[str] = None
+
+
+class Pipeline:
+    def __init__(
+        self,
+        ddl_filepath: str,
+        table_name: str,
+        schema: str = "bronze",
+        conflict_targets: Optional[List[ConflictTarget]] = None,
+        update_columns: Optional[List[str]] = None,
+        engine: Optional[Engine] = None,
+    ):
+        """
+        Args:
+            ddl_filepath (str): DDL creating the table, relative to bronze/src/DDL
+            table_name (str): Target table, without the schema
+            schema (str): Target schema
+            conflict_targets (list): Unique indexes to upsert on; rows are appended when empty
+            update_columns (list): Columns overwritten on conflict; every loaded
+                column outside the conflict target when None, none when empty
+            engine (Engine): Engine to load with (defaults to DatabaseEngine)
+        """
+        path = Path(ddl_filepath)
+        self.ddl_filepath = path if path.is_absolute() else DDL_DIRECTORY / path
+        self.schema = schema
+        self.table_name = table_name
+        self.qualified_name = f"{schema}.{table_name}"
+        self.conflict_targets = conflict_targets or []
+        self.update_columns = update_columns
+        self.engine = engine
+        self.runs: List[Dict[str, Any]] = []
+
+    def _get_engine(self) -> Engine:
+        return self.engine or DatabaseEngine.get_engine()
+
+    def create_table(self) -> None:
+        """Run the DDL file for the target table."""
+        ddl = self.ddl_filepath.read_text()
+        with self._get_engine().begin() as conn:
+            conn.exec_driver_sql(ddl)
+        print(f"Created {self.qualified_name} from {self.ddl_filepath.name}")
+
+    def ingest_from_df(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Load a DataFrame into the target table.
+
+        Args:
+            df (pd.DataFrame): Rows to load; column names must match the table
+
+        Returns:
+            dict: rows staged, rows written, CSV bytes sent and seconds taken
+        """
+        columns = list(df.columns)
+        # Typed columns (Int64, categoricals, UTC datetimes) become plain Python
+        # values here, with every missing marker (NaN, NaT, pd.NA) as None
+        rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+        return self._load(columns, rows)
+
+    def ingest_records(self, records: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Load a batch of record dicts (all with the same keys) into the target table."""
+        if not records:
+            return self._load([], [])
+        columns = list(records[0].keys())
+        return self._load(columns, ([record[column] for column in columns] for record in records))
+
+    def _merge_statements(self, columns: List[str]) -> List[str]:
+        column_list = ", ".join(columns)
+        select = f"SELECT {column_list} FROM pipeline_stage"
+        if not self.conflict_targets:
+            return [f"INSERT INTO {self.qualified_name} ({column_list}) {select}"]
+
+        statements = []
+        for target in self.conflict_targets:
+            conflict_columns = ", ".join(target.columns)
+            update_columns = (
+                [c for c in columns if c not in target.columns]
+                if self.update_columns is None
+                else [c for c in self.update_columns if c in columns]
+            )
+            if update_columns:
+                assignments = ", ".join(f"{c} = EXCLUDED.{c}" for c in update_columns)
+                current = ", ".join(f"{self.qualified_name}.{c}" for c in update_columns)
+                incoming = ", ".join(f"EXCLUDED.{c}" for c in update_columns)
+                # Unchanged rows are neither rewritten nor counted as written
+                action = (
+                    f"DO UPDATE SET {assignments} "
+                    f"WHERE ROW({current}) IS DISTINCT FROM ROW({incoming})"
+                )
+            else:
+                action = "DO NOTHING"
+            predicate = f" WHERE {target.where}" if target.where else ""
+            # A row may only be upserted once per statement, so drop in-batch
+            # duplicates, keeping the last one staged (e.g. a message's latest edit)
+            statements.append(
+                f"""
+                INSERT INTO {self.qualified_name} ({column_list})
+                SELECT DISTINCT ON ({conflict_columns}) {column_list}
+                FROM pipeline_stage{predicate}
+                ORDER BY {conflict_columns}, {STAGE_ORDINAL_COLUMN} DESC
+                ON CONFLICT ({conflict_columns}){predicate}
+                {action}
+                """
+            )
+        return statements
+
+    def _load(self, columns: List[str], rows: Iterable[Any]) -> Dict[str, Any]:
+        start = time.perf_counter()
+        buffer = io.StringIO()
+        # Unquoted empty fields are NULL in COPY's csv format, quoted ones are ''
+        writer = csv.writer(buffer, quoting=csv.QUOTE_NOTNULL)
+        staged = 0
+        for row in rows:
+            writer.writerow(row)
+            staged += 1
+        payload = buffer.getvalue().encode("utf-8")
+
+        written = 0
+        if staged:
+            column_list = ", ".join(columns)
+            connection = self._get_engine().raw_connection()
+            try:
+                with connection.cursor() as cursor:
+                    # A full backfill can take longer than the connection's
+                    # per-query timeout; lift it for this load's transaction only
+                    cursor.execute("SET LOCAL statement_timeout = 0")
+                    # The ordinal numbers rows in the order COPY staged them
+                    cursor.execute(
+                        f"CREATE TEMP TABLE pipeline_stage "
+                        f"(LIKE {self.qualified_name} INCLUDING DEFAULTS, "
+                        f"{STAGE_ORDINAL_COLUMN} BIGSERIAL) ON COMMIT DROP"
+                    )
+                    cursor.copy_expert(
+                        f"COPY pipeline_stage ({column_list}) FROM STDIN WITH (FORMAT csv)",
+                        io.BytesIO(payload),
+                    )
+                    for statement in self._merge_statements(columns):
+                        cursor.execute(statement)
+                        written += max(cursor.rowcount, 0)
+                connection.commit()
+            except Exception:
+                connection.rollback()
+                self.runs.append({"table": self.qualified_name, "status": "failed", "rows_staged": staged})
+                raise
+            finally:
+                connection.close()
+
+        stats = {
+            "table": self.qualified_name,
+            "status": "success",
+            "rows_staged": staged,
+            "rows_written": written,
+            "bytes": len(payload),
+            "seconds": round(time.perf_counter() - start, 3),
+        }
+        self.runs.append(stats)
+        print(
+            f"Loaded {self.qualified_name}: {staged} rows staged, {written} written, "
+            f"{stats['bytes'] / 1024:.1f} KiB in {stats['seconds']:.2f}s"
+        )
+        return stats
+
+    def test_run_status(self) -> bool:
+        """Print a summary of every load this run and return whether all of them succeeded."""
+        if not self.runs:
+            print(f"No loads into {self.qualified_name} this run")
+            return True
+        succeeded = [run for run in self.runs if run["status"] == "success"]
+        rows = sum(run["rows_staged"] for run in succeeded)
+        written = sum(run["rows_written"] for run in succeeded)
+        size = sum(run["bytes"] for run in succeeded)
+        seconds = sum(run["seconds"] for run in succeeded)
+        rate = rows / seconds if seconds else 0
+        print(
+            f"{self.qualified_name}: {len(succeeded)}/{len(self.runs)} loads succeeded, "
+            f"{rows} rows staged, {written} written, {size / 1024:.1f} KiB "
+            f"in {seconds:.2f}s ({rate:.0f} rows/s)"
+        )
+        return len(succeeded) == len(self.runs)
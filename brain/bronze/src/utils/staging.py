@@ -0,0 +1,137 @@
+"""
+Local staging area for resumable bronze extractions.
+
+An extraction writes each completed batch to a file in its staging directory,
+next to a manifest.json recording the staged batches, which of them have been
+loaded, and the extractor's checkpoint (cursors and completed channels etc.).
+A crashed extraction resumes from the checkpoint instead of from zero, and the
+load step ingests whatever is staged, so extract and load can run separately.
+
+Batches are written as Parquet when pyarrow is installed. Otherwise they are
+written as pickles, which also keep the typed dtypes but are only for local,
+trusted staging.
+"""
+
+import json
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+DEFAULT_STAGING_ROOT = Path(__file__).resolve().parents[2] / "staging"
+MANIFEST_NAME = "manifest.json"
+
+
+class StagingArea:
+    def __init__(self, directory: Path):
+        """
+        Args:
+            directory (Path): Staging directory of one source (created when missing)
+        """
+        self.directory = Path(directory)
+        self.manifest_path = self.directory / MANIFEST_NAME
+        self.manifest = self._read_manifest()
+
+    def _read_manifest(self) -> Dict[str, Any]:
+        if self.manifest_path.exists():
+            return json.loads(self.manifest_path.read_text())
+        return {
+            "started_at": None,
+            "finished": False,
+            "checkpoint": None,
+            "result": None,
+            "batches": [],
+        }
+
+    def _write_manifest(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.manifest["updated_at"] = datetime.now().isoformat()
+        # Write then rename so a crash never leaves a half-written manifest
+        temp_path = self.manifest_path.with_suffix(".json.tmp")
+        temp_path.write_text(json.dumps(self.manifest, indent=2, default=str))
+        temp_path.replace(self.manifest_path)
+
+    @property
+    def in_progress(self) -> bool:
+        """Whether an extraction started here and has not finished."""
+        return self.manifest["started_at"] is not None and not self.manifest["finished"]
+
+    @property
+    def finished(self) -> bool:
+        return self.manifest["finished"]
+
+    @property
+    def checkpoint(self) -> Optional[Dict[str, Any]]:
+        return self.manifest["checkpoint"]
+
+    def start(self) -> None:
+        """Begin a new extraction, unless one is in progress and will be resumed."""
+        if not self.in_progress:
+            self.manifest["started_at"] = datetime.now().isoformat()
+            self.manifest["finished"] = False
+            self.manifest["checkpoint"] = None
+            self.manifest["result"] = None
+            self._write_manifest()
+
+    def write_batch(self, df: pd.DataFrame, checkpoint: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Stage a batch and, with it, the checkpoint it completes.
+
+        Args:
+            df (pd.DataFrame): Batch to stage
+            checkpoint (dict): JSON-serializable extractor progress covered by this batch
+
+        Returns:
+            str: File name of the staged batch
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        suffix = ".parquet" if PARQUET_AVAILABLE else ".pkl"
+        file_name = f"batch_{len(self.manifest['batches']):06d}{suffix}"
+        temp_path = self.directory / (file_name + ".tmp")
+        if PARQUET_AVAILABLE:
+            df.to_parquet(temp_path, index=False)
+        else:
+            df.to_pickle(temp_path)
+        temp_path.replace(self.directory / file_name)
+
+        # The manifest only names the batch once its file is complete
+        self.manifest["batches"].append({"file": file_name, "rows": len(df), "loaded": False})
+        if checkpoint is not None:
+            self.manifest["checkpoint"] = checkpoint
+        self._write_manifest()
+        return file_name
+
+    def finish(self, result: Optional[Dict[str, Any]] = None) -> None:
+        """Mark the extraction finished, with anything the load step needs afterwards."""
+        self.manifest["finished"] = True
+        self.manifest["result"] = result
+        self._write_manifest()
+
+    def pending_batches(self) -> List[Dict[str, Any]]:
+        return [batch for batch in self.manifest["batches"] if not batch["loaded"]]
+
+    def read_batch(self, batch: Dict[str, Any]) -> pd.DataFrame:
+        path = self.directory / batch["file"]
+        if path.suffix == ".parquet":
+            return pd.read_parquet(path)
+        return pd.read_pickle(path)
+
+    def mark_loaded(self, batch: Dict[str, Any]) -> None:
+        """Record a batch as loaded and delete its file."""
+        batch["loaded"] = True
+        self._write_manifest()
+        (self.directory / batch["file"]).unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Remove the staging directory once everything in it has been loaded."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.manifest = self._read_manifest()
@@ -0,0 +1,95 @@
+"""
+Schema-driven dtypes for bronze DataFrames.
+
+Extractors build frames from lists of dicts, which leaves every column as
+Python objects: snowflake ids as boxed ints, timestamps as ISO strings and the
+same channel name repeated on every row. apply_schema converts the columns to
+compact dtypes (numpy/nullable ints, UTC datetimes, categoricals and,
+optionally, Arrow-backed strings) and reports the memory saved.
+"""
+
+from typing import Dict, Tuple
+
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+
+    ARROW_STRINGS_AVAILABLE = True
+except ImportError:
+    ARROW_STRINGS_AVAILABLE = False
+
+# Logical column types understood by apply_schema
+ID = "id"                    # non-null snowflake id -> int64
+NULLABLE_ID = "nullable_id"  # snowflake id or None -> Int64
+TIMESTAMP = "timestamp"      # ISO string -> datetime64[ns, UTC]
+CATEGORY = "category"        # low-cardinality text -> category
+TEXT = "text"                # free text -> object, or string[pyarrow]
+BOOLEAN = "boolean"          # bool
+
+DISCORD_SCHEMA: Dict[str, str] = {
+    "channel_id": ID,
+    "channel_name": CATEGORY,
+    "channel_created_at": TIMESTAMP,
+    "thread_name": CATEGORY,
+    "thread_id": NULLABLE_ID,
+    "message_id": ID,
+    "discord_username": CATEGORY,
+    "discord_user_id": ID,
+    "content": TEXT,
+    "chat_created_at": TIMESTAMP,
+    "chat_edited_at": TIMESTAMP,
+    "is_thread": BOOLEAN,
+}
+
+
+def _convert(series: pd.Series, column_type: str, arrow_strings: bool) -> pd.Series:
+    if column_type == ID:
+        return series.astype("int64")
+    if column_type == NULLABLE_ID:
+        return series.astype("Int64")
+    if column_type == TIMESTAMP:
+        return pd.to_datetime(series, utc=True, format="ISO8601")
+    if column_type == CATEGORY:
+        return series.astype("category")
+    if column_type == BOOLEAN:
+        return series.astype("bool")
+    if column_type == TEXT and arrow_strings:
+        return series.astype("string[pyarrow]")
+    return series
+
+
+def apply_schema(
+    df: pd.DataFrame, schema: Dict[str, str], arrow_strings: bool = False
+) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """
+    Convert the columns of df named in schema to their compact dtypes.
+
+    Args:
+        df (pd.DataFrame): Frame with object columns; columns not in schema are kept as is
+        schema (dict): Column name to logical type (ID, TIMESTAMP, CATEGORY, ...)
+        arrow_strings (bool): Store TEXT columns as string[pyarrow] (needs pyarrow)
+
+    Returns:
+        tuple: The typed frame and its memory before/after in bytes
+    """
+    if arrow_strings and not ARROW_STRINGS_AVAILABLE:
+        raise ImportError("arrow_strings=True requires pyarrow to be installed")
+
+    bytes_before = int(df.memory_usage(deep=True).sum())
+    typed = df.copy(deep=False)
+    for column, column_type in schema.items():
+        if column in typed.columns:
+            typed[column] = _convert(typed[column], column_type, arrow_strings)
+    bytes_after = int(typed.memory_usage(deep=True).sum())
+    return typed, {"bytes_before": bytes_before, "bytes_after": bytes_after}
+
+
+def format_memory_report(stats: Dict[str, int]) -> str:
+    before, after = stats["bytes_before"], stats["bytes_after"]
+    saved = before - after
+    percent = saved / before * 100 if before else 0.0
+    return (
+        f"{before / 2**20:.1f} MiB -> {after / 2**20:.1f} MiB "
+        f"(saved {saved / 2**20:.1f} MiB, {percent:.0f}%)"
+    )
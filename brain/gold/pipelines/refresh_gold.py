@@ -0,0 +1,50 @@
+"""
+Refresh the gold materialized views (gold.users_base).
+
+Usage:
+    python brain/gold/pipelines/refresh_gold.py                # refresh once
+    python brain/gold/pipelines/refresh_gold.py --interval 60  # refresh every 60 seconds
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# as these files are not installed as packages with uv we need to go to the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from custom_tools.brain.postgres.postgres import refresh_gold_views
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Refresh the gold materialized views")
+    parser.add_argument(
+        "--interval",
+        type=int,
+        default=0,
+        help="Seconds between refreshes; 0 refreshes once and exits (default: 0)",
+    )
+    parser.add_argument(
+        "--blocking",
+        action="store_true",
+        help="Refresh without CONCURRENTLY (needed if a view was created WITH NO DATA)",
+    )
+    args = parser.parse_args()
+
+    while True:
+        try:
+            refresh_gold_views(concurrently=not args.blocking)
+        except Exception as e:
+            print(f"Error refreshing gold views: {e}")
+            if not args.interval:
+                raise
+        if not args.interval:
+            break
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+-- Gold layer view of every user fact, keyed by integer ids so readers filter
+-- on discord_id or user_id directly instead of joining on the user's name.
+-- A plain view: the bot reads facts from silver.fact (indexed on user_id,
+-- created_at) so its own writes are visible immediately, and a materialized
+-- copy would only add refresh cost. Drop the earlier materialized version first.
+DROP MATERIALIZED VIEW IF EXISTS gold.all_facts;
+
+CREATE OR REPLACE VIEW gold.all_facts AS
+SELECT
+    f.fact_id,
+    f.user_id,
+    u.discord_id,
+    u.name AS user_name,
+    f.fact_text,
+    f.created_at
+FROM silver.fact f
+JOIN silver.user u ON u.id = f.user_id;
@@ -0,0 +1,15 @@
+-- Gold layer view of users, materialized so get_user does not re-derive it
+-- from silver on every call. Every silver.user column is kept, keyed on id.
+-- Replaces the plain view of the same name: DROP VIEW IF EXISTS gold.users_base CASCADE;
+-- (and any earlier materialized version that also carried a duplicate user_id:
+-- DROP MATERIALIZED VIEW IF EXISTS gold.users_base;)
+CREATE MATERIALIZED VIEW IF NOT EXISTS gold.users_base AS
+SELECT u.*
+FROM silver.user u;
+
+-- Unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_base_id
+ON gold.users_base(id);
+
+CREATE INDEX IF NOT EXISTS idx_users_base_discord_id
+ON gold.users_base(discord_id);
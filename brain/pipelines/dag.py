@@ -0,0 +1,245 @@
+"""
+Run the brain pipelines bronze -> silver -> gold as one dependency graph.
+
+    discord_channel
+    discord_chat
+    notion_committee ──> silver_committee ──> gold
+
+Each stage starts as soon as every stage it depends on has finished, so the
+bronze extractions run concurrently, silver.committee is merged once the
+Notion committee load is done, and gold is refreshed after the silver layer.
+
+Stages report the rows they changed. A stage is skipped when it succeeded
+last time, its SQL file is unchanged and every stage it depends on changed
+nothing; a stage with a SQL file and no dependencies is skipped on the first
+two alone. Bronze stages are incremental themselves, so they always run, and
+gold always runs because it also reads the users and facts the bot writes
+outside this DAG. Per-stage status, timings and row counts are printed and
+kept in a JSON state file between runs.
+
+Usage:
+    python brain/pipelines/dag.py                       # run every stage
+    python brain/pipelines/dag.py --only discord_chat   # one stage and what it feeds
+    python brain/pipelines/dag.py --force               # never skip
+"""
+
+import argparse
+import asyncio
+import hashlib
+import importlib.util
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# as these files are not installed as packages with uv we need to go to the project root
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from custom_tools.brain.postgres.postgres import DatabaseEngine, refresh_gold_views
+
+BRAIN_ROOT = Path(__file__).resolve().parents[1]
+DEFAULT_STATE_PATH = BRAIN_ROOT / "bronze" / "staging" / "dag_state.json"
+
+
+@dataclass
+class Stage:
+    """
+    A pipeline step.
+
+    run returns the number of rows it changed (None when it cannot tell, which
+    counts as changed). sql_file, when set, is fingerprinted so editing it
+    forces the stage to run again. Stages that also read tables written outside
+    the DAG set skippable=False.
+    """
+
+    name: str
+    run: Callable[[], Optional[int]]
+    depends_on: List[str] = field(default_factory=list)
+    sql_file: Optional[Path] = None
+    skippable: bool = True
+
+
+def _load_bronze_pipeline(name: str) -> Any:
+    """Import a script from brain/bronze/pipelines (they are not a package)."""
+    path = BRAIN_ROOT / "bronze" / "pipelines" / f"{name}.py"
+    spec = importlib.util.spec_from_file_location(f"bronze_pipeline_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def run_sql_file(path: Path) -> Optional[int]:
+    """Run a SQL file in one transaction; returns the rows its last statement changed."""
+    with DatabaseEngine.get_engine().begin() as conn:
+        result = conn.exec_driver_sql(path.read_text())
+        return result.rowcount if result.rowcount >= 0 else None
+
+
+def refresh_gold() -> None:
+    refresh_gold_views()
+
+
+def default_stages() -> List[Stage]:
+    silver_committee_dml = BRAIN_ROOT / "silver" / "src" / "DML" / "committee.sql"
+    return [
+        Stage("discord_channel", lambda: _load_bronze_pipeline("discord_channel").run()),
+        Stage("discord_chat", lambda: _load_bronze_pipeline("discord_chat").run()),
+        Stage("notion_committee", lambda: _load_bronze_pipeline("notion_committee").run()),
+        Stage(
+            "silver_committee",
+            lambda: run_sql_file(silver_committee_dml),
+            depends_on=["notion_committee"],
+            sql_file=silver_committee_dml,
+        ),
+        Stage(
+            "gold",
+            refresh_gold,
+            depends_on=["silver_committee"],
+            # The gold views read the users and facts the bot writes outside this DAG
+            skippable=False,
+        ),
+    ]
+
+
+def _fingerprint(stage: Stage) -> Optional[str]:
+    if stage.sql_file is None:
+        return None
+    return hashlib.md5(stage.sql_file.read_bytes()).hexdigest()
+
+
+class DagRunner:
+    def __init__(self, stages: List[Stage], state_path: Path = DEFAULT_STATE_PATH, force: bool = False):
+        """
+        Args:
+            stages (list): Stages to run; dependencies must be among them
+            state_path (Path): JSON file keeping each stage's last result
+            force (bool): Run every stage even when nothing upstream changed
+        """
+        self.stages = {stage.name: stage for stage in stages}
+        for stage in stages:
+            missing = [name for name in stage.depends_on if name not in self.stages]
+            if missing:
+                raise ValueError(f"Stage {stage.name} depends on unknown stages {missing}")
+        self.state_path = state_path
+        self.force = force
+        self.previous = json.loads(state_path.read_text()) if state_path.exists() else {}
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    def _should_skip(self, stage: Stage) -> bool:
+        if self.force or not stage.skippable:
+            return False
+        if not stage.depends_on and stage.sql_file is None:
+            # Source extractions are incremental themselves; always ask them for changes
+            return False
+        previous = self.previous.get(stage.name, {})
+        if previous.get("status") not in ("succeeded", "skipped"):
+            return False
+        if previous.get("fingerprint") != _fingerprint(stage):
+            return False
+        return all(self.results[name]["rows_changed"] == 0 for name in stage.depends_on)
+
+    async def _run_stage(self, stage: Stage, upstream: List[asyncio.Task]) -> None:
+        await asyncio.gather(*upstream)
+        failed = [name for name in stage.depends_on if self.results[name]["status"] in ("failed", "blocked")]
+        result: Dict[str, Any] = {
+            "status": None,
+            "rows_changed": 0,
+            "seconds": 0.0,
+            "fingerprint": _fingerprint(stage),
+            "finished_at": None,
+        }
+        if failed:
+            result["status"] = "blocked"
+            result["error"] = f"upstream failed: {', '.join(failed)}"
+        elif self._should_skip(stage):
+            result["status"] = "skipped"
+        else:
+            print(f"▶️  {stage.name} started")
+            start = time.perf_counter()
+            try:
+                # Stages are blocking (some run their own event loop), so each gets a thread
+                rows = await asyncio.to_thread(stage.run)
+                result["status"] = "succeeded"
+                result["rows_changed"] = rows
+            except Exception as e:
+                result["status"] = "failed"
+                result["error"] = str(e)
+            result["seconds"] = round(time.perf_counter() - start, 3)
+        result["finished_at"] = datetime.now().isoformat()
+        self.results[stage.name] = result
+        print(self._format_result(stage.name, result))
+
+    @staticmethod
+    def _format_result(name: str, result: Dict[str, Any]) -> str:
+        icon = {"succeeded": "✅", "skipped": "⏭️ ", "failed": "❌", "blocked": "⛔"}[result["status"]]
+        rows = "?" if result["rows_changed"] is None else result["rows_changed"]
+        line = f"{icon} {name}: {result['status']} in {result['seconds']:.1f}s, {rows} rows changed"
+        if result.get("error"):
+            line += f" ({result['error']})"
+        return line
+
+    async def run(self) -> Dict[str, Dict[str, Any]]:
+        """Run every stage once its dependencies are done; returns each stage's result."""
+        tasks: Dict[str, asyncio.Task] = {}
+
+        def schedule(name: str) -> asyncio.Task:
+            if name not in tasks:
+                stage = self.stages[name]
+                upstream = [schedule(dependency) for dependency in stage.depends_on]
+                tasks[name] = asyncio.create_task(self._run_stage(stage, upstream))
+            return tasks[name]
+
+        for name in self.stages:
+            schedule(name)
+        await asyncio.gather(*tasks.values())
+
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        self.state_path.write_text(json.dumps({**self.previous, **self.results}, indent=2))
+        return self.results
+
+
+def _with_downstream(stages: List[Stage], names: List[str]) -> List[Stage]:
+    """The named stages and every stage that depends on them, directly or not."""
+    selected = set(names)
+    changed = True
+    while changed:
+        changed = False
+        for stage in stages:
+            if stage.name not in selected and selected.intersection(stage.depends_on):
+                selected.add(stage.name)
+                changed = True
+    # Dependencies outside the selection count as unchanged, so they are dropped
+    return [
+        Stage(s.name, s.run, [d for d in s.depends_on if d in selected], s.sql_file, s.skippable)
+        for s in stages
+        if s.name in selected
+    ]
+
+
+def main():
+    stages = default_stages()
+    parser = argparse.ArgumentParser(description="Run the bronze -> silver -> gold pipelines")
+    parser.add_argument("--only", nargs="+", choices=[stage.name for stage in stages],
+                        help="Run only these stages and the stages downstream of them")
+    parser.add_argument("--force", action="store_true", help="Never skip a stage")
+    parser.add_argument("--state-path", type=Path, default=DEFAULT_STATE_PATH,
+                        help="JSON file keeping the results of the previous run")
+    args = parser.parse_args()
+
+    if args.only:
+        stages = _with_downstream(stages, args.only)
+    start = time.perf_counter()
+    results = asyncio.run(DagRunner(stages, args.state_path, args.force).run())
+    print(f"DAG finished in {time.perf_counter() - start:.1f}s")
+    if any(result["status"] in ("failed", "blocked") for result in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,4 +8,7 @@ CREATE TABLE IF NOT EXISTS silver.committee (
     ingestion_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
-CREATE INDEX IF NOT EXISTS idx_committee_member_id ON silver.committee(member_id);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_committee_member_id ON silver.committee(member_id);
+
+-- The committee DML upserts on notion_id
+CREATE UNIQUE INDEX IF NOT EXISTS idx_committee_notion_id ON silver.committee(notion_id);
@@ -12,4 +12,25 @@ CREATE TABLE IF NOT EXISTS silver.committee_personal_checkup (
 );
 
 CREATE INDEX IF NOT EXISTS idx_committee_personal_checkup_checkup_id ON silver.committee_personal_checkup(checkup_id);
-CREATE INDEX IF NOT EXISTS idx_committee_personal_checkup_member_id ON silver.committee_personal_checkup(member_id);
\ No newline at end of file
+CREATE INDEX IF NOT EXISTS idx_committee_personal_checkup_member_id ON silver.committee_personal_checkup(member_id);
+
+-- At most one current row per member. Backs the single-statement SCD2 writer
+-- and the is_current lookups.
+CREATE UNIQUE INDEX IF NOT EXISTS idx_committee_personal_checkup_current
+ON silver.committee_personal_checkup(member_id)
+WHERE is_current;
+
+-- Validity period of each SCD2 version, for as-of lookups.
+-- GREATEST keeps the range valid (empty) if a version was closed before it started.
+CREATE EXTENSION IF NOT EXISTS btree_gist;
+
+ALTER TABLE silver.committee_personal_checkup
+ADD COLUMN IF NOT EXISTS valid_period TSRANGE
+GENERATED ALWAYS AS (tsrange(start_date, GREATEST(start_date, end_date), '[)')) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_committee_personal_checkup_member_id_valid_period
+ON silver.committee_personal_checkup USING GIST (member_id, valid_period);
+
+-- Bounded "last N checkups" reads
+CREATE INDEX IF NOT EXISTS idx_committee_personal_checkup_member_id_start_date
+ON silver.committee_personal_checkup(member_id, start_date DESC);
\ No newline at end of file
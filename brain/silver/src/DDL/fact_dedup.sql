@@ -0,0 +1,17 @@
+-- Normalized-text hash so the same fact is stored at most once per user
+-- (used by set_user_fact and set_user_facts_bulk via ON CONFLICT DO NOTHING)
+ALTER TABLE silver.fact
+ADD COLUMN IF NOT EXISTS fact_hash TEXT
+GENERATED ALWAYS AS (
+    md5(lower(regexp_replace(btrim(COALESCE(fact_text, '')), '\s+', ' ', 'g')))
+) STORED;
+
+-- Remove existing duplicates (keeping the oldest fact) before adding the constraint
+DELETE FROM silver.fact f
+USING silver.fact older
+WHERE f.user_id = older.user_id
+AND f.fact_hash = older.fact_hash
+AND f.fact_id > older.fact_id;
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_fact_user_id_fact_hash
+ON silver.fact(user_id, fact_hash);
@@ -0,0 +1,18 @@
+-- Full-text and trigram search over silver.fact (used by search_user_facts)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+ALTER TABLE silver.fact
+ADD COLUMN IF NOT EXISTS fact_tsv TSVECTOR
+GENERATED ALWAYS AS (to_tsvector('english', COALESCE(fact_text, ''))) STORED;
+
+-- Indexes
+CREATE INDEX IF NOT EXISTS idx_fact_fact_tsv
+ON silver.fact USING GIN (fact_tsv);
+
+CREATE INDEX IF NOT EXISTS idx_fact_fact_text_trgm
+ON silver.fact USING GIN (fact_text gin_trgm_ops);
+
+-- Per-user fact reads are ordered newest first (get_user_fact, get_author_context)
+DROP INDEX IF EXISTS silver.idx_fact_user_id;
+CREATE INDEX IF NOT EXISTS idx_fact_user_id_created_at
+ON silver.fact(user_id, created_at DESC);
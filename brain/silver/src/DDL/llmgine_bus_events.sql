@@ -1,13 +1,144 @@
-CREATE TABLE silver.llmgine_bus_events (
-    event_id SERIAL PRIMARY KEY,
+-- Bus event log, range partitioned by month on event_timestamp.
+-- Migrating from the old unpartitioned table:
+--   ALTER TABLE silver.llmgine_bus_events RENAME TO llmgine_bus_events_legacy;
+--   (run this file)
+--   INSERT INTO silver.llmgine_bus_events SELECT * FROM silver.llmgine_bus_events_legacy;
+CREATE TABLE IF NOT EXISTS silver.llmgine_bus_events (
+    event_id SERIAL,
     event_data JSONB,
-    event_timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    event_class_name VARCHAR(255)
+    event_timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    event_class_name VARCHAR(255),
+    PRIMARY KEY (event_id, event_timestamp)
+) PARTITION BY RANGE (event_timestamp);
+
+-- Catches rows outside every monthly partition (e.g. legacy history)
+CREATE TABLE IF NOT EXISTS silver.llmgine_bus_events_default
+PARTITION OF silver.llmgine_bus_events DEFAULT;
+
+-- Indexes (created on every partition)
+-- Events arrive in timestamp order, so a BRIN index stays tiny and never bloats
+CREATE INDEX IF NOT EXISTS idx_llmgine_bus_events_event_timestamp
+ON silver.llmgine_bus_events USING BRIN (event_timestamp);
+
+CREATE INDEX IF NOT EXISTS idx_llmgine_bus_events_class_name_event_timestamp
+ON silver.llmgine_bus_events(event_class_name, event_timestamp);
+
+-- Daily per-class counts kept after old partitions are dropped
+CREATE TABLE IF NOT EXISTS silver.llmgine_bus_event_daily_counts (
+    event_date DATE NOT NULL,
+    event_class_name VARCHAR(255) NOT NULL,
+    event_count BIGINT NOT NULL,
+    PRIMARY KEY (event_date, event_class_name)
 );
 
--- Indexes
-CREATE INDEX IF NOT EXISTS idx_llmgine_bus_events_event_timestamp 
-ON silver.llmgine_bus_events(event_timestamp);
+-- Create the monthly partitions for the current month and the next months_ahead months.
+-- Rows for a new month that already landed in the default partition are moved
+-- into it: the partition is built as a plain table, filled, then attached,
+-- since PARTITION OF fails while the default partition holds rows in its range.
+CREATE OR REPLACE FUNCTION silver.ensure_llmgine_bus_events_partitions(months_ahead INT DEFAULT 2)
+RETURNS INT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    month_start DATE;
+    month_end DATE;
+    partition_name TEXT;
+    created INT := 0;
+BEGIN
+    FOR i IN 0..months_ahead LOOP
+        month_start := (date_trunc('month', CURRENT_DATE) + make_interval(months => i))::DATE;
+        month_end := (month_start + INTERVAL '1 month')::DATE;
+        partition_name := format('llmgine_bus_events_y%sm%s', to_char(month_start, 'YYYY'), to_char(month_start, 'MM'));
+        IF to_regclass(format('silver.%I', partition_name)) IS NULL THEN
+            EXECUTE format(
+                'CREATE TABLE silver.%I (LIKE silver.llmgine_bus_events INCLUDING DEFAULTS INCLUDING CONSTRAINTS)',
+                partition_name
+            );
+            EXECUTE format(
+                'WITH moved AS (
+                     DELETE FROM silver.llmgine_bus_events_default
+                     WHERE event_timestamp >= %L AND event_timestamp < %L
+                     RETURNING *
+                 )
+                 INSERT INTO silver.%I SELECT * FROM moved',
+                month_start,
+                month_end,
+                partition_name
+            );
+            EXECUTE format(
+                'ALTER TABLE silver.llmgine_bus_events ATTACH PARTITION silver.%I FOR VALUES FROM (%L) TO (%L)',
+                partition_name,
+                month_start,
+                month_end
+            );
+            created := created + 1;
+        END IF;
+    END LOOP;
+    RETURN created;
+END;
+$$;
+
+-- Roll up monthly partitions older than retention_months into daily per-class
+-- counts, then detach them (and drop them unless keep_detached is set). Rows
+-- older than the cutoff in the default partition are rolled up and deleted too,
+-- unless keep_detached is set.
+CREATE OR REPLACE FUNCTION silver.rollup_llmgine_bus_events(
+    retention_months INT DEFAULT 6,
+    keep_detached BOOLEAN DEFAULT FALSE
+)
+RETURNS INT
+LANGUAGE plpgsql
+AS $$
+DECLARE
+    cutoff DATE := (date_trunc('month', CURRENT_DATE) - make_interval(months => retention_months))::DATE;
+    old_partition RECORD;
+    rolled_up INT := 0;
+BEGIN
+    FOR old_partition IN
+        -- The partition bound, e.g. FOR VALUES FROM ('2025-01-01 00:00:00') TO ('2025-02-01 00:00:00'),
+        -- is NULL here for the default partition
+        SELECT c.relname,
+               substring(
+                   pg_get_expr(c.relpartbound, c.oid) FROM 'TO \(''([^'']+)''\)'
+               )::TIMESTAMP AS upper_bound
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'silver.llmgine_bus_events'::REGCLASS
+    LOOP
+        CONTINUE WHEN old_partition.upper_bound IS NULL OR old_partition.upper_bound > cutoff;
+
+        EXECUTE format(
+            'INSERT INTO silver.llmgine_bus_event_daily_counts (event_date, event_class_name, event_count)
+             SELECT event_timestamp::DATE, COALESCE(event_class_name, ''(unknown)''), COUNT(*)
+             FROM silver.%I
+             GROUP BY 1, 2
+             ON CONFLICT (event_date, event_class_name)
+             DO UPDATE SET event_count = EXCLUDED.event_count',
+            old_partition.relname
+        );
+        EXECUTE format('ALTER TABLE silver.llmgine_bus_events DETACH PARTITION silver.%I', old_partition.relname);
+        IF NOT keep_detached THEN
+            EXECUTE format('DROP TABLE silver.%I', old_partition.relname);
+        END IF;
+        rolled_up := rolled_up + 1;
+    END LOOP;
+
+    IF NOT keep_detached THEN
+        -- The counted rows are deleted in the same statement, so counts add up across runs
+        WITH expired AS (
+            DELETE FROM silver.llmgine_bus_events_default
+            WHERE event_timestamp < cutoff
+            RETURNING event_timestamp, event_class_name
+        )
+        INSERT INTO silver.llmgine_bus_event_daily_counts (event_date, event_class_name, event_count)
+        SELECT event_timestamp::DATE, COALESCE(event_class_name, '(unknown)'), COUNT(*)
+        FROM expired
+        GROUP BY 1, 2
+        ON CONFLICT (event_date, event_class_name)
+        DO UPDATE SET event_count = silver.llmgine_bus_event_daily_counts.event_count + EXCLUDED.event_count;
+    END IF;
+    RETURN rolled_up;
+END;
+$$;
 
-CREATE INDEX IF NOT EXISTS idx_llmgine_bus_events_class_name 
-ON silver.llmgine_bus_events(event_class_name);
\ No newline at end of file
+SELECT silver.ensure_llmgine_bus_events_partitions();
@@ -1,11 +1,16 @@
--- Temp Values Insert DML for AI@DSCubed Core + Winter Cohort
-TRUNCATE TABLE silver.committee;
+-- Temp Values Upsert DML for AI@DSCubed Core + Winter Cohort
+-- Merged on notion_id (the member's Notion user id) rather than truncated and
+-- reloaded: silver.committee_personal_checkup references member_id, so existing
+-- members must keep their rows. bronze.notion_committee is keyed by committee
+-- page id and has no Notion user or Discord ids, so it cannot replace this list.
 INSERT INTO silver.committee (
     name,
     notion_id,
     discord_id,
     discord_dm_channel_id
-) VALUES
+)
+SELECT name, notion_id, discord_id, discord_dm_channel_id
+FROM (VALUES
 ('Aaron', '221d872b-594c-810a-b29f-000244aab3de', 768791482874069000, 1389153820856029286),
 ('Andy L', '117d872b-594c-814b-8bcd-0002bec43618', 1263063218977505300, 1389153964066340944),
 ('Andy S', '221d872b-594c-8176-ac25-0002c94be5d9', 810799312874766300, 1389153786127323207),
@@ -30,4 +35,10 @@ INSERT INTO silver.committee (
 ('Anthea', '1bad872b-594c-81bb-95f1-00025ff97f57', 768799326141939764, 1389152971010347089),
 ('Alina', '1bbd872b-594c-81e9-a745-000238c87ef8', 1283302616759275581, 1389152912772694147),
 ('Pranav', 'c005948c-9115-4a4d-b3c2-78286fa75fdb', 373796704450772992, 1389152752499822622)
-;
\ No newline at end of file
+) AS roster (name, notion_id, discord_id, discord_dm_channel_id)
+ON CONFLICT (notion_id) DO UPDATE SET
+    name = EXCLUDED.name,
+    discord_id = EXCLUDED.discord_id,
+    discord_dm_channel_id = EXCLUDED.discord_dm_channel_id
+WHERE ROW(silver.committee.name, silver.committee.discord_id, silver.committee.discord_dm_channel_id)
+    IS DISTINCT FROM ROW(EXCLUDED.name, EXCLUDED.discord_id, EXCLUDED.discord_dm_channel_id);
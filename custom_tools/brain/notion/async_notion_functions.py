@@ -0,0 +1,394 @@
+"""
+Async counterparts of the notion_functions tools.
+
+Same names, arguments, docstrings (and so the same tool schemas) and results as
+notion_functions, built on notion_client.AsyncClient so engines can register
+them as coroutine tools and await Notion without blocking the event loop. All
+calls share one pooled httpx session, and reads and writes go through the same
+NotionCache and task mirror as the sync tools.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Literal, Optional
+
+import httpx
+from notion_client import APIResponseError, AsyncClient
+
+from custom_tools.brain.notion.notion_functions import (
+    ACTIVE_PROJECTS_FILTER,
+    NOTION_PRODUCTION_DATABASE_ID_PROJECTS,
+    NOTION_PRODUCTION_DATABASE_ID_TASKS,
+    NOTION_QUERY_PAGE_SIZE,
+    NotionCache,
+    _active_tasks_filter,
+    _apply_written_task,
+    _create_task_properties,
+    _parse_projects,
+    _parse_task,
+    _parse_users,
+    _task_progress_properties,
+    _update_task_properties,
+    get_task_mirror,
+    project_map_type,
+)
+
+NOTION_MAX_CONNECTIONS: int = 10
+NOTION_KEEPALIVE_CONNECTIONS: int = 5
+NOTION_TIMEOUT_SECONDS: float = 60.0
+# Notion allows an average of three requests per second per integration
+NOTION_REQUESTS_PER_SECOND: float = 3.0
+NOTION_MAX_RETRIES: int = 3
+BULK_UPDATE_FIELDS: tuple[str, ...] = (
+    "task_name",
+    "task_status",
+    "task_description",
+    "task_due_date",
+    "task_in_charge",
+    "task_event_project",
+)
+
+
+class AsyncNotionClient:
+    _instance: Optional[AsyncClient] = None
+
+    def __new__(cls):
+        """
+        Create or return the singleton async Notion client
+
+        Every request goes through one httpx session, so connections (and their
+        TLS handshakes) are reused across tool calls.
+
+        Returns:
+            AsyncClient: The async Notion client instance
+        """
+        if cls._instance is None:
+            notion_token = os.getenv("NOTION_TOKEN")
+            if not notion_token:
+                raise ValueError("NOTION_TOKEN environment variable is not set")
+            session = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=NOTION_MAX_CONNECTIONS,
+                    max_keepalive_connections=NOTION_KEEPALIVE_CONNECTIONS,
+                ),
+                timeout=NOTION_TIMEOUT_SECONDS,
+            )
+            cls._instance = AsyncClient(auth=notion_token, client=session)
+        return cls._instance
+
+    @classmethod
+    async def close(cls) -> None:
+        """Close the shared session; the next call opens a new one."""
+        if cls._instance is not None:
+            await cls._instance.aclose()
+            cls._instance = None
+
+
+class TokenBucket:
+    """
+    Async token bucket: acquire() waits until a request may be sent.
+
+    Tokens refill at rate per second up to capacity, so short bursts go out at
+    once and longer runs settle at the rate.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None) -> None:
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+                self._updated_at = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+_rate_limiter: Optional[TokenBucket] = None
+
+
+def _get_rate_limiter() -> TokenBucket:
+    # Created lazily so its lock belongs to the running event loop
+    global _rate_limiter
+    if _rate_limiter is None:
+        _rate_limiter = TokenBucket(NOTION_REQUESTS_PER_SECOND)
+    return _rate_limiter
+
+
+async def _rate_limited(request: Callable[[], Awaitable[Any]]) -> Any:
+    """Send a Notion request under the rate limit, retrying 429s after Retry-After."""
+    for attempt in range(NOTION_MAX_RETRIES + 1):
+        await _get_rate_limiter().acquire()
+        try:
+            return await request()
+        except APIResponseError as e:
+            if e.status != 429 or attempt == NOTION_MAX_RETRIES:
+                raise
+            retry_after = e.headers.get("retry-after") if e.headers else None
+            delay = float(retry_after) if retry_after else 2.0**attempt
+            print(f"Notion rate limited, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+
+async def aiter_database_query(
+    database_id: str,
+    filter_obj: Optional[dict[str, Any]] = None,
+    page_size: int = NOTION_QUERY_PAGE_SIZE,
+) -> AsyncIterator[dict[str, Any]]:
+    """
+    Yield every page matching a database query, following next_cursor.
+
+    Like notion_functions.iter_database_query, the next page is requested while
+    the caller works through the current one.
+
+    Args:
+        database_id: The Notion database to query
+        filter_obj: Notion filter object
+        page_size: Results per request (at most 100)
+    """
+    notion_client: AsyncClient = AsyncNotionClient()
+
+    async def query(start_cursor: Optional[str]) -> Any:
+        kwargs: dict[str, Any] = {"database_id": database_id, "page_size": page_size}
+        if filter_obj:
+            kwargs["filter"] = filter_obj
+        if start_cursor:
+            kwargs["start_cursor"] = start_cursor
+        return await notion_client.databases.query(**kwargs)
+
+    pending: Optional[asyncio.Task[Any]] = asyncio.create_task(query(None))
+    try:
+        while pending is not None:
+            response: Any = await pending
+            pending = None
+            if response.get("has_more") and response.get("next_cursor"):
+                pending = asyncio.create_task(query(response["next_cursor"]))
+            for page in response.get("results", []):
+                yield page
+    finally:
+        # The caller stopped early; don't leave the prefetch running
+        if pending is not None:
+            pending.cancel()
+
+
+async def get_all_users() -> list[dict[str, str]]:
+    """
+    Get all users from the users database
+    """
+    notion_client: AsyncClient = AsyncNotionClient()
+    response: Any = await notion_client.users.list()
+    return _parse_users(response)
+
+
+async def get_active_tasks(
+    notion_user_id: Optional[str] = None,
+    notion_project_id: Optional[str] = None,
+) -> dict[Any, dict[str, Any]]:
+    """
+    Get all active tasks from the tasks database with provided filters
+
+    Args:
+        notion_user_id: The NOTION user ID of the person in charge of the task (DO NOT USE DISCORD USER ID)
+        notion_project_id: The ID of the project the task is associated with (need to call get_active_projects to get the list of projects and their ids)
+
+    Returns:
+        A list of tasks
+    """
+    mirror = get_task_mirror(NOTION_PRODUCTION_DATABASE_ID_TASKS)
+    if mirror is not None:
+        return mirror.get_active_tasks(notion_user_id, notion_project_id)
+    key = (notion_user_id or None, notion_project_id or None)
+    cached = NotionCache.get_tasks(key)
+    if cached is not None:
+        return cached
+    tasks = {
+        task.get("id"): _parse_task(task)
+        async for task in aiter_database_query(
+            NOTION_PRODUCTION_DATABASE_ID_TASKS,
+            _active_tasks_filter(notion_user_id, notion_project_id),
+        )
+    }
+    NotionCache.set_tasks(key, tasks)
+    return tasks
+
+
+async def get_active_projects() -> project_map_type:
+    """
+    Get all projects from the projects database
+    """
+    mirror = get_task_mirror(NOTION_PRODUCTION_DATABASE_ID_PROJECTS)
+    if mirror is not None:
+        return mirror.get_active_projects()
+    cached = NotionCache.get_projects()
+    if cached is not None:
+        return cached
+    parsed_projects = _parse_projects(
+        [
+            project
+            async for project in aiter_database_query(
+                NOTION_PRODUCTION_DATABASE_ID_PROJECTS, ACTIVE_PROJECTS_FILTER
+            )
+        ]
+    )
+    NotionCache.set_projects(parsed_projects)
+    return parsed_projects
+
+
+async def create_task(
+    task_name: str,
+    user_id: str,  # TODO change to a list
+    due_date: Optional[str] = None,
+    notion_project_id: Optional[str] = None,
+) -> Any:
+    """
+    Create a new task in the tasks database
+
+    Args:
+        task_name: The name of the task
+        due_date: The due date of the task
+        user_id: The user ID of the person in charge of the task
+        notion_project_id: The ID of the project the task is associated with (need to call get_active_projects to get the list of projects and their ids)
+
+    Returns:
+        str: Success or failure of the creation
+    """
+    notion_client: AsyncClient = AsyncNotionClient()
+    response: Any = await notion_client.pages.create(
+        parent={"database_id": NOTION_PRODUCTION_DATABASE_ID_TASKS},
+        properties=_create_task_properties(task_name, user_id, due_date, notion_project_id),
+    )
+    _apply_written_task(response)
+    return response
+
+
+async def update_task(
+    notion_task_id: str,
+    task_name: Optional[str] = None,
+    task_status: Optional[
+        Literal["Not Started", "In Progress", "Blocked", "To Review", "Done", "Archive"]
+    ] = None,
+    task_description: Optional[str] = None,
+    task_due_date: Optional[str] = None,
+    task_in_charge: Optional[list[str]] = None,
+    task_event_project: Optional[str] = None,
+) -> Any:
+    """
+    Update a task in the tasks database
+
+    Args:
+        notion_task_id: The ID of the task to update
+        task_name: The name of the task
+        task_status: The status of the task (to label a task as finished or completed, use Done word)
+        task_description: The detailed description of the task
+        task_due_date: The due date of the task ISO 8601 with timezone (we are in AEST)
+        task_in_charge: A list of the notion IDs of the people in charge of the task
+        task_event_project: The ID of the project the task is associated with (need to call get_active_projects to get the list of projects and their ids)
+
+    Returns:
+        Success or failure of the update
+    """
+    notion_client: AsyncClient = AsyncNotionClient()
+    response: Any = await notion_client.pages.update(
+        page_id=notion_task_id,
+        properties=_update_task_properties(
+            task_name,
+            task_status,
+            task_description,
+            task_due_date,
+            task_in_charge,
+            task_event_project,
+        ),
+    )
+    _apply_written_task(response)
+    return response
+
+
+async def update_task_progress(
+    notion_task_id: str,
+    user_name: str,
+    task_progress: str,
+) -> Any:
+    """
+    Update the progress of a task by the people in charge of the task
+
+    Args:
+        notion_task_id: The notion ID of the task to update
+        user_name: The name of the user who is updating the progress
+        task_progress: The a brief description of the progress of the task, mentioned by the people in charge of the task during scrum check-ins
+
+    Returns:
+        Success or failure of the update
+    """
+    notion_client: AsyncClient = AsyncNotionClient()
+    # Get the old task progress
+    page: Any = await notion_client.pages.retrieve(page_id=notion_task_id)
+    response: Any = await notion_client.pages.update(
+        page_id=notion_task_id,
+        properties=_task_progress_properties(page, user_name, task_progress),
+    )
+    _apply_written_task(response)
+    return response
+
+
+async def _apply_task_patch(patch: dict[str, Any]) -> dict[str, Any]:
+    notion_task_id = patch.get("notion_task_id")
+    if not notion_task_id:
+        return {"notion_task_id": None, "success": False, "error": "notion_task_id is required"}
+    unknown = set(patch) - {"notion_task_id", "task_progress", "user_name", *BULK_UPDATE_FIELDS}
+    if unknown:
+        return {
+            "notion_task_id": notion_task_id,
+            "success": False,
+            "error": f"unknown fields: {', '.join(sorted(unknown))}",
+        }
+    if patch.get("task_progress") and not patch.get("user_name"):
+        return {
+            "notion_task_id": notion_task_id,
+            "success": False,
+            "error": "user_name is required with task_progress",
+        }
+
+    notion_client: AsyncClient = AsyncNotionClient()
+    try:
+        properties = _update_task_properties(
+            **{field: patch[field] for field in BULK_UPDATE_FIELDS if field in patch}
+        )
+        if patch.get("task_progress"):
+            page: Any = await _rate_limited(
+                lambda: notion_client.pages.retrieve(page_id=notion_task_id)
+            )
+            properties.update(
+                _task_progress_properties(page, patch["user_name"], patch["task_progress"])
+            )
+        if not properties:
+            return {"notion_task_id": notion_task_id, "success": False, "error": "nothing to update"}
+        # Progress and field changes go out as one update per task
+        response: Any = await _rate_limited(
+            lambda: notion_client.pages.update(page_id=notion_task_id, properties=properties)
+        )
+    except Exception as e:
+        return {"notion_task_id": notion_task_id, "success": False, "error": str(e)}
+    _apply_written_task(response)
+    return {"notion_task_id": notion_task_id, "success": True, "updated": sorted(properties)}
+
+
+async def update_tasks_bulk(task_updates: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """
+    Update several tasks at once, instead of calling update_task and update_task_progress for each task
+
+    Args:
+        task_updates: A list of task updates. Each update is an object with notion_task_id (required) and any of task_name, task_status (one of Not Started, In Progress, Blocked, To Review, Done, Archive), task_description, task_due_date (ISO 8601 with timezone, we are in AEST), task_in_charge (list of notion user IDs), task_event_project (project ID), and task_progress with user_name (the person reporting the progress)
+
+    Returns:
+        One result per update, in order, with notion_task_id, success and an error when it failed
+    """
+    return list(await asyncio.gather(*(_apply_task_patch(patch) for patch in task_updates)))
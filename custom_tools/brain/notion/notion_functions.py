@@ -1,7 +1,10 @@
 import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from enum import Enum
-from typing import Any, Literal, NewType, Optional
+from typing import Any, Iterable, Iterator, Literal, NewType, Optional
 
 from dotenv import load_dotenv
 from notion_client import Client
@@ -46,7 +49,10 @@ def get_all_users() -> list[dict[str, str]]:
     """
     notion_client: Client = NotionClient()
     response: Any = notion_client.users.list()
+    return _parse_users(response)
 
+
+def _parse_users(response: Any) -> list[dict[str, str]]:
     notion_users: list[dict[str, Any]] = response.get("results", [])
 
     user_list: list[dict[str, str]] = []
@@ -61,23 +67,158 @@ def get_all_users() -> list[dict[str, str]]:
     return user_list
 
 
-def get_active_tasks(
-    notion_user_id: Optional[str] = None,
-    notion_project_id: Optional[str] = None,
-) -> dict[Any, dict[str, Any]]:
+# Largest page Notion returns for a database query
+NOTION_QUERY_PAGE_SIZE: int = 100
+
+DEFAULT_NOTION_CACHE_TTL_SECONDS: int = 60
+# Statuses get_active_tasks leaves out
+INACTIVE_TASK_STATUSES: tuple[str, ...] = ("Done", "Archive")
+
+TaskFilterKey = tuple[Optional[str], Optional[str]]
+
+# Local mirror (see task_mirror.py) that answers reads while it is fresh
+_task_mirror: Optional[Any] = None
+
+
+def set_task_mirror(mirror: Optional[Any]) -> None:
+    """Route task and project reads through a TaskMirror, or back to Notion with None."""
+    global _task_mirror
+    _task_mirror = mirror
+
+
+def get_task_mirror(database_id: str) -> Optional[Any]:
+    """The task mirror, if one is running and fresh for the given database."""
+    if _task_mirror is not None and _task_mirror.is_fresh(database_id):
+        return _task_mirror
+    return None
+
+
+def _apply_written_task(page: Any) -> None:
+    """Make a task page returned by one of our writes visible to later reads."""
+    NotionCache.apply_task_page(page)
+    if _task_mirror is not None:
+        _task_mirror.apply_task_page(page)
+
+
+class NotionCache:
+    """
+    Per-process read-through cache of get_active_tasks and get_active_projects.
+
+    Task results are keyed by their (notion_user_id, notion_project_id) filter.
+    Pages returned by create_task, update_task and update_task_progress are
+    patched into every cached task result whose filter they match (and removed
+    from the ones they no longer match), so our own writes are visible
+    immediately. Entries expire after NOTION_CACHE_TTL_SECONDS, which bounds
+    staleness from edits made directly in Notion.
     """
-    Get all active tasks from the tasks database with provided filters
 
-    Args:
-        notion_user_id: The NOTION user ID of the person in charge of the task (DO NOT USE DISCORD USER ID)
-        notion_project_id: The ID of the project the task is associated with (need to call get_active_projects to get the list of projects and their ids)
+    _tasks: dict[TaskFilterKey, tuple[float, dict[Any, dict[str, Any]]]] = {}
+    _projects: Optional[tuple[float, Any]] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def ttl_seconds(cls) -> int:
+        value = os.getenv("NOTION_CACHE_TTL_SECONDS")
+        return int(value) if value else DEFAULT_NOTION_CACHE_TTL_SECONDS
+
+    @classmethod
+    def _fresh(cls, loaded_at: float) -> bool:
+        return time.monotonic() - loaded_at < cls.ttl_seconds()
+
+    @classmethod
+    def get_tasks(cls, key: TaskFilterKey) -> Optional[dict[Any, dict[str, Any]]]:
+        with cls._lock:
+            entry = cls._tasks.get(key)
+            if entry is None or not cls._fresh(entry[0]):
+                return None
+            # Copies, so callers cannot mutate the cached tasks
+            return {task_id: dict(task) for task_id, task in entry[1].items()}
+
+    @classmethod
+    def set_tasks(cls, key: TaskFilterKey, tasks: dict[Any, dict[str, Any]]) -> None:
+        with cls._lock:
+            cls._tasks[key] = (
+                time.monotonic(),
+                {task_id: dict(task) for task_id, task in tasks.items()},
+            )
+
+    @classmethod
+    def get_projects(cls) -> Optional[Any]:
+        with cls._lock:
+            if cls._projects is None or not cls._fresh(cls._projects[0]):
+                return None
+            return dict(cls._projects[1])
+
+    @classmethod
+    def set_projects(cls, projects: Any) -> None:
+        with cls._lock:
+            cls._projects = (time.monotonic(), dict(projects))
+
+    @classmethod
+    def apply_task_page(cls, page: Any) -> None:
+        """Patch a created or updated task page into the cached task results."""
+        task_id = page.get("id") if isinstance(page, dict) else None
+        if not task_id or "properties" not in page:
+            # Not a full page object; the affected entries cannot be known
+            cls.invalidate()
+            return
+        task = _parse_task(page)
+        active = task["status"] not in INACTIVE_TASK_STATUSES
+        with cls._lock:
+            for (notion_user_id, notion_project_id), (_, tasks) in cls._tasks.items():
+                if active and _task_matches(page, notion_user_id, notion_project_id):
+                    tasks[task_id] = task
+                else:
+                    tasks.pop(task_id, None)
+
+    @classmethod
+    def invalidate(cls) -> None:
+        with cls._lock:
+            cls._tasks = {}
+            cls._projects = None
+
+
+def iter_database_query(
+    database_id: str,
+    filter_obj: Optional[dict[str, Any]] = None,
+    page_size: int = NOTION_QUERY_PAGE_SIZE,
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield every page matching a database query, following next_cursor.
 
-    Returns:
-        A list of tasks
+    The next page is requested in the background while the caller works through
+    the current one, so parsing overlaps the Notion round trip.
+
+    Args:
+        database_id: The Notion database to query
+        filter_obj: Notion filter object
+        page_size: Results per request (at most 100)
     """
     notion_client: Client = NotionClient()
+
+    def query(start_cursor: Optional[str]) -> Any:
+        kwargs: dict[str, Any] = {"database_id": database_id, "page_size": page_size}
+        if filter_obj:
+            kwargs["filter"] = filter_obj
+        if start_cursor:
+            kwargs["start_cursor"] = start_cursor
+        return notion_client.databases.query(**kwargs)
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="notion-prefetch") as executor:
+        pending: Optional[Future[Any]] = executor.submit(query, None)
+        while pending is not None:
+            response: Any = pending.result()
+            pending = None
+            if response.get("has_more") and response.get("next_cursor"):
+                pending = executor.submit(query, response["next_cursor"])
+            yield from response.get("results", [])
+
+
+def _active_tasks_filter(
+    notion_user_id: Optional[str], notion_project_id: Optional[str]
+) -> dict[str, Any]:
     # filter by Project AND UserID
-    filter_obj = {
+    filter_obj: dict[str, Any] = {
         "and": [
             {
                 "property": "Status",
@@ -103,83 +244,134 @@ def get_active_tasks(
                 "people": {"contains": notion_user_id},
             }
         )
-
-    # quering Task database
-    response: Any = notion_client.databases.query(
-        database_id=NOTION_PRODUCTION_DATABASE_ID_TASKS,
-        filter=filter_obj,  # should database id be notion_project_id?
+    return filter_obj
+
+
+def _parse_task(task: dict[str, Any]) -> dict[str, Any]:
+    # Get properties safely
+    properties = task.get("properties", {})
+
+    # Parse name safely
+    name = None
+    name_prop = properties.get("Name", {})
+    title_list = name_prop.get("title", [])
+    if title_list and len(title_list) > 0:
+        text_obj = title_list[0].get("text", {})
+        name = text_obj.get("content")
+
+    # Parse status safely
+    status = None
+    status_prop = properties.get("Status", {})
+    status_obj = status_prop.get("status", {})
+    if status_obj:
+        status = status_obj.get("name")
+
+    # Parse due date safely
+    due_date = None
+    due_date_prop = properties.get("Due Dates", {})
+    date_obj = due_date_prop.get("date", {})
+    if date_obj:
+        due_date = date_obj.get("start")
+
+    # Parse project safely
+    project = None
+    relation_prop = properties.get("Event/Project", {}) or properties.get(
+        "Event", {}
     )
+    relation_list = relation_prop.get("relation", [])
+    if relation_list and len(relation_list) > 0:
+        project = relation_list[0].get("id")
+
+    # Parse userID in charge safely
+    notion_user_id = None
+    userID_inCharge_prop = properties.get("In Charge", {})
+    userID_inCharge_list = userID_inCharge_prop.get("people", [])
+    if userID_inCharge_list and len(userID_inCharge_list) > 0:
+        # notion_user_id = userID_inCharge_list[0].get("id")
+        notion_user_id = userID_inCharge_list
+
+    # Parse task description safely
+    task_description = None
+    task_description_prop = properties.get("Description", {})
+    task_description_list = task_description_prop.get("rich_text", [])
+    if task_description_list and len(task_description_list) > 0:
+        task_description = task_description_list[0].get("text", {}).get("content")
+
+    # Parse task progress safely
+    task_progress = None
+    task_progress_prop = properties.get("Task Progress", {})
+    task_progress_list = task_progress_prop.get("rich_text", [])
+    if task_progress_list and len(task_progress_list) > 0:
+        task_progress = task_progress_list[0].get("text", {}).get("content")
+
+    return {
+        "name": name,
+        "status": status,
+        "due_date": due_date,
+        "project": project,
+        "notion_user_id": notion_user_id,
+        "task_description": task_description,
+        "task_progress": task_progress,
+    }
 
-    tasks: list[dict[str, Any]] = response.get("results", [])
-    parsed_tasks: dict[Any, dict[str, Any]] = {}
-    for task in tasks:
-        # Get properties safely
-        properties = task.get("properties", {})
 
-        # Parse name safely
-        name = None
-        name_prop = properties.get("Name", {})
-        title_list = name_prop.get("title", [])
-        if title_list and len(title_list) > 0:
-            text_obj = title_list[0].get("text", {})
-            name = text_obj.get("content")
+def _task_matches(
+    page: dict[str, Any],
+    notion_user_id: Optional[str],
+    notion_project_id: Optional[str],
+) -> bool:
+    """Whether a task page passes the user/project part of _active_tasks_filter."""
+    properties = page.get("properties", {})
+    if notion_user_id:
+        people = properties.get("In Charge", {}).get("people", [])
+        if notion_user_id not in {person.get("id") for person in people}:
+            return False
+    if notion_project_id:
+        relation = properties.get("Event/Project", {}).get("relation", [])
+        if notion_project_id not in {related.get("id") for related in relation}:
+            return False
+    return True
 
-        # Parse status safely
-        status = None
-        status_prop = properties.get("Status", {})
-        status_obj = status_prop.get("status", {})
-        if status_obj:
-            status = status_obj.get("name")
-
-        # Parse due date safely
-        due_date = None
-        due_date_prop = properties.get("Due Dates", {})
-        date_obj = due_date_prop.get("date", {})
-        if date_obj:
-            due_date = date_obj.get("start")
-
-        # Parse project safely
-        project = None
-        relation_prop = properties.get("Event/Project", {}) or properties.get(
-            "Event", {}
-        )
-        relation_list = relation_prop.get("relation", [])
-        if relation_list and len(relation_list) > 0:
-            project = relation_list[0].get("id")
-
-        # Parse userID in charge safely
-        notion_user_id = None
-        userID_inCharge_prop = properties.get("In Charge", {})
-        userID_inCharge_list = userID_inCharge_prop.get("people", [])
-        if userID_inCharge_list and len(userID_inCharge_list) > 0:
-            # notion_user_id = userID_inCharge_list[0].get("id")
-            notion_user_id = userID_inCharge_list
-
-        # Parse task description safely
-        task_description = None
-        task_description_prop = properties.get("Description", {})
-        task_description_list = task_description_prop.get("rich_text", [])
-        if task_description_list and len(task_description_list) > 0:
-            task_description = task_description_list[0].get("text", {}).get("content")
-
-        # Parse task progress safely
-        task_progress = None
-        task_progress_prop = properties.get("Task Progress", {})
-        task_progress_list = task_progress_prop.get("rich_text", [])
-        if task_progress_list and len(task_progress_list) > 0:
-            task_progress = task_progress_list[0].get("text", {}).get("content")
-
-        parsed_tasks[task.get("id")] = {
-            "name": name,
-            "status": status,
-            "due_date": due_date,
-            "project": project,
-            "notion_user_id": notion_user_id,
-            "task_description": task_description,
-            "task_progress": task_progress,
-        }
 
-    return parsed_tasks
+def iter_active_tasks(
+    notion_user_id: Optional[str] = None,
+    notion_project_id: Optional[str] = None,
+) -> Iterator[tuple[str, dict[str, Any]]]:
+    """
+    Yield (task id, parsed task) for every active task matching the filters,
+    fetching the tasks database page by page.
+    """
+    for task in iter_database_query(
+        NOTION_PRODUCTION_DATABASE_ID_TASKS,
+        _active_tasks_filter(notion_user_id, notion_project_id),
+    ):
+        yield task.get("id"), _parse_task(task)
+
+
+def get_active_tasks(
+    notion_user_id: Optional[str] = None,
+    notion_project_id: Optional[str] = None,
+) -> dict[Any, dict[str, Any]]:
+    """
+    Get all active tasks from the tasks database with provided filters
+
+    Args:
+        notion_user_id: The NOTION user ID of the person in charge of the task (DO NOT USE DISCORD USER ID)
+        notion_project_id: The ID of the project the task is associated with (need to call get_active_projects to get the list of projects and their ids)
+
+    Returns:
+        A list of tasks
+    """
+    mirror = get_task_mirror(NOTION_PRODUCTION_DATABASE_ID_TASKS)
+    if mirror is not None:
+        return mirror.get_active_tasks(notion_user_id, notion_project_id)
+    key = (notion_user_id or None, notion_project_id or None)
+    cached = NotionCache.get_tasks(key)
+    if cached is not None:
+        return cached
+    tasks = dict(iter_active_tasks(notion_user_id, notion_project_id))
+    NotionCache.set_tasks(key, tasks)
+    return tasks
 
 
 project_id_type = NewType("project_id_type", str)
@@ -190,20 +382,30 @@ def get_active_projects() -> project_map_type:
     """
     Get all projects from the projects database
     """
-    notion_client: Client = NotionClient()
-    response: Any = notion_client.databases.query(
-        database_id=NOTION_PRODUCTION_DATABASE_ID_PROJECTS,
-        # TODO filter based on active
-        filter={
-            "or": [
-                {"property": "Progress", "select": {"does_not_equal": "Archive"}},
-                {"property": "Progress", "select": {"does_not_equal": "Cancelled"}},
-                {"property": "Progress", "select": {"does_not_equal": "Finished"}},
-            ]
-        },
+    mirror = get_task_mirror(NOTION_PRODUCTION_DATABASE_ID_PROJECTS)
+    if mirror is not None:
+        return mirror.get_active_projects()
+    cached = NotionCache.get_projects()
+    if cached is not None:
+        return cached
+    parsed_projects = _parse_projects(
+        iter_database_query(NOTION_PRODUCTION_DATABASE_ID_PROJECTS, ACTIVE_PROJECTS_FILTER)
     )
+    NotionCache.set_projects(parsed_projects)
+    return parsed_projects
+
 
-    projects: list[dict[str, Any]] = response.get("results", [])
+# TODO filter based on active
+ACTIVE_PROJECTS_FILTER: dict[str, Any] = {
+    "or": [
+        {"property": "Progress", "select": {"does_not_equal": "Archive"}},
+        {"property": "Progress", "select": {"does_not_equal": "Cancelled"}},
+        {"property": "Progress", "select": {"does_not_equal": "Finished"}},
+    ]
+}
+
+
+def _parse_projects(projects: Iterable[dict[str, Any]]) -> project_map_type:
     parsed_projects: project_map_type = {}
     for project in projects:
         name: Optional[Any] = None
@@ -239,6 +441,21 @@ def create_task(
     Returns:
         str: Success or failure of the creation
     """
+    notion_client: Client = NotionClient()
+    response: Any = notion_client.pages.create(
+        parent={"database_id": NOTION_PRODUCTION_DATABASE_ID_TASKS},
+        properties=_create_task_properties(task_name, user_id, due_date, notion_project_id),
+    )
+    _apply_written_task(response)
+    return response
+
+
+def _create_task_properties(
+    task_name: str,
+    user_id: str,
+    due_date: Optional[str],
+    notion_project_id: Optional[str],
+) -> dict[str, Any]:
     properties: dict[str, Any] = {
         "Name": {"title": [{"text": {"content": task_name}}]},
         "In Charge": {"people": [{"object": "user", "id": user_id}]},
@@ -247,13 +464,7 @@ def create_task(
         properties["Due Dates"] = {"date": {"start": due_date}}
     if notion_project_id:
         properties["Event/Project"] = {"relation": [{"id": notion_project_id}]}
-
-    notion_client: Client = NotionClient()
-    response: Any = notion_client.pages.create(
-        parent={"database_id": NOTION_PRODUCTION_DATABASE_ID_TASKS},
-        properties=properties,
-    )
-    return response
+    return properties
 
 
 def update_task(
@@ -282,7 +493,32 @@ def update_task(
     Returns:
         Success or failure of the update
     """
-    properties = {}
+    notion_client: Client = NotionClient()
+    response: Any = notion_client.pages.update(
+        page_id=notion_task_id,
+        properties=_update_task_properties(
+            task_name,
+            task_status,
+            task_description,
+            task_due_date,
+            task_in_charge,
+            task_event_project,
+        ),
+    )
+    _apply_written_task(response)
+
+    return response
+
+
+def _update_task_properties(
+    task_name: Optional[str] = None,
+    task_status: Optional[str] = None,
+    task_description: Optional[str] = None,
+    task_due_date: Optional[str] = None,
+    task_in_charge: Optional[list[str]] = None,
+    task_event_project: Optional[str] = None,
+) -> dict[str, Any]:
+    properties: dict[str, Any] = {}
 
     if task_name:
         properties["Name"] = {"title": [{"text": {"content": task_name}}]}
@@ -292,7 +528,7 @@ def update_task(
 
     if task_due_date:
         date = datetime.fromisoformat(task_due_date)
-        properties["Due Dates"] = {"date": {"start": date}}
+        properties["Due Dates"] = {"date": {"start": date.isoformat()}}
 
     if task_in_charge:
         properties["In Charge"] = {
@@ -300,18 +536,13 @@ def update_task(
         }
 
     if task_event_project:
-        properties["Event/Project"] = {"relation": {"contains": task_event_project}}
+        properties["Event/Project"] = {"relation": [{"id": task_event_project}]}
 
     if task_description:
         properties["Description"] = {"rich_text": [{"text": {"content": task_description}}]}
 
-    notion_client: Client = NotionClient()
-    response: Any = notion_client.pages.update(
-        page_id=notion_task_id,
-        properties=properties,
-    )
+    return properties
 
-    return response
 
 def update_task_progress(
     notion_task_id: str,
@@ -335,7 +566,21 @@ def update_task_progress(
     response: Any = notion_client.pages.retrieve(
         page_id=notion_task_id,
     )
-    properties = response.get("properties", {})
+    new_properties = _task_progress_properties(response, user_name, task_progress)
+
+    notion_client: Client = NotionClient()
+    response: Any = notion_client.pages.update(
+        page_id=notion_task_id,
+        properties=new_properties,
+    )
+    _apply_written_task(response)
+
+    return response
+
+
+def _task_progress_properties(page: Any, user_name: str, task_progress: str) -> dict[str, Any]:
+    """Append a progress entry to the task's existing Task Progress."""
+    properties = page.get("properties", {})
 
     # Parse old task progress
     old_task_progress = ""
@@ -348,15 +593,7 @@ def update_task_progress(
     # Format progress
     formatted_task_progress = f"{user_name} (Updated at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}): {task_progress}"
     new_properties["Task Progress"] = {"rich_text": [{"text": {"content": old_task_progress + '\n' + formatted_task_progress}}]}
-
-    
-    notion_client: Client = NotionClient()
-    response: Any = notion_client.pages.update(
-        page_id=notion_task_id,
-        properties=new_properties,
-    )
-
-    return response
+    return new_properties
 
 # if __name__ == "__main__":
     # import time
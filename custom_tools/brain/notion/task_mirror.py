@@ -0,0 +1,309 @@
+"""
+Local SQLite mirror of the Notion Tasks and Projects databases.
+
+A background thread polls both databases for pages edited since the last sync
+(a last_edited_time on_or_after filter) and upserts them into a SQLite file
+with indexes on assignee, project and status, plus a periodic full resync that
+drops pages deleted in Notion. While the mirror is running and its last
+successful sync is within max_staleness_seconds, get_active_tasks and
+get_active_projects are answered from it; once it falls behind they read
+Notion live again.
+
+Enable it by setting NOTION_MIRROR_PATH (see programs/discord/bot.py) or by
+calling TaskMirror.start(path).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Optional
+
+from custom_tools.brain.notion import notion_functions
+from custom_tools.brain.notion.notion_functions import (
+    INACTIVE_TASK_STATUSES,
+    NOTION_PRODUCTION_DATABASE_ID_PROJECTS,
+    NOTION_PRODUCTION_DATABASE_ID_TASKS,
+    _parse_task,
+    iter_database_query,
+    project_map_type,
+)
+
+DEFAULT_MIRROR_SYNC_INTERVAL_SECONDS: int = 30
+DEFAULT_MIRROR_MAX_STALENESS_SECONDS: int = 300
+# Incremental syncs cannot see deleted pages, so rebuild from scratch this often
+MIRROR_FULL_RESYNC_INTERVAL_SECONDS: int = 60 * 60
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    status TEXT,
+    last_edited_time TEXT NOT NULL,
+    task JSON NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status);
+
+CREATE TABLE IF NOT EXISTS task_assignees (
+    task_id TEXT NOT NULL,
+    notion_user_id TEXT NOT NULL,
+    PRIMARY KEY (notion_user_id, task_id)
+);
+CREATE INDEX IF NOT EXISTS idx_task_assignees_task_id ON task_assignees(task_id);
+
+CREATE TABLE IF NOT EXISTS task_projects (
+    task_id TEXT NOT NULL,
+    project_id TEXT NOT NULL,
+    PRIMARY KEY (project_id, task_id)
+);
+CREATE INDEX IF NOT EXISTS idx_task_projects_task_id ON task_projects(task_id);
+
+CREATE TABLE IF NOT EXISTS projects (
+    project_id TEXT PRIMARY KEY,
+    name TEXT,
+    last_edited_time TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    database_id TEXT PRIMARY KEY,
+    watermark TEXT,
+    synced_at REAL,
+    full_synced_at REAL
+);
+"""
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _project_name(page: dict[str, Any]) -> Optional[str]:
+    title_list = page.get("properties", {}).get("Name", {}).get("title", [])
+    if title_list:
+        return title_list[0].get("text", {}).get("content")
+    return None
+
+
+class TaskMirror:
+    _instance: Optional["TaskMirror"] = None
+
+    def __init__(
+        self,
+        path: str,
+        sync_interval_seconds: int = DEFAULT_MIRROR_SYNC_INTERVAL_SECONDS,
+        max_staleness_seconds: int = DEFAULT_MIRROR_MAX_STALENESS_SECONDS,
+    ) -> None:
+        """
+        Args:
+            path: SQLite file holding the mirror (":memory:" for a process-local one)
+            sync_interval_seconds: Seconds between delta syncs
+            max_staleness_seconds: Oldest successful sync reads may be answered from
+        """
+        self.path = path
+        self.sync_interval_seconds = sync_interval_seconds
+        self.max_staleness_seconds = max_staleness_seconds
+        # One connection shared by the sync thread and readers, serialized by the lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def start(
+        cls,
+        path: str,
+        sync_interval_seconds: Optional[int] = None,
+        max_staleness_seconds: Optional[int] = None,
+    ) -> "TaskMirror":
+        """
+        Create the process-wide mirror and keep it synced on a background thread.
+
+        Reads go to Notion until the first sync completes.
+        """
+        if cls._instance is None:
+            mirror = cls(
+                path,
+                sync_interval_seconds
+                or _env_int("NOTION_MIRROR_SYNC_INTERVAL_SECONDS", DEFAULT_MIRROR_SYNC_INTERVAL_SECONDS),
+                max_staleness_seconds
+                or _env_int("NOTION_MIRROR_MAX_STALENESS_SECONDS", DEFAULT_MIRROR_MAX_STALENESS_SECONDS),
+            )
+            mirror._thread = threading.Thread(
+                target=mirror._run, name="notion-task-mirror", daemon=True
+            )
+            mirror._thread.start()
+            notion_functions.set_task_mirror(mirror)
+            cls._instance = mirror
+        return cls._instance
+
+    @classmethod
+    def stop(cls) -> None:
+        if cls._instance is None:
+            return
+        mirror = cls._instance
+        notion_functions.set_task_mirror(None)
+        mirror._stop.set()
+        if mirror._thread is not None:
+            mirror._thread.join()
+        mirror._conn.close()
+        cls._instance = None
+
+    def _run(self) -> None:
+        while True:
+            try:
+                self.sync()
+            except Exception as e:
+                # Reads fall back to Notion once the mirror goes stale
+                print(f"Failed to sync the Notion task mirror: {e}")
+            if self._stop.wait(self.sync_interval_seconds):
+                return
+
+    def _sync_state(self, database_id: str) -> tuple[Optional[str], float, float]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT watermark, synced_at, full_synced_at FROM sync_state WHERE database_id = ?",
+                (database_id,),
+            ).fetchone()
+        if row is None:
+            return None, 0.0, 0.0
+        return row[0], row[1] or 0.0, row[2] or 0.0
+
+    def sync(self) -> dict[str, int]:
+        """Pull every task and project page edited since the last sync; returns pages synced."""
+        return {
+            "tasks": self._sync_database(NOTION_PRODUCTION_DATABASE_ID_TASKS, self._upsert_tasks, "tasks"),
+            "projects": self._sync_database(
+                NOTION_PRODUCTION_DATABASE_ID_PROJECTS, self._upsert_projects, "projects"
+            ),
+        }
+
+    def _sync_database(self, database_id: str, upsert: Any, table: str) -> int:
+        watermark, _, full_synced_at = self._sync_state(database_id)
+        full = watermark is None or time.time() - full_synced_at > MIRROR_FULL_RESYNC_INTERVAL_SECONDS
+        filter_obj = None
+        if not full:
+            # Notion rounds last_edited_time to the minute, so on_or_after re-reads
+            # the boundary minute; upserts make that harmless
+            filter_obj = {"timestamp": "last_edited_time", "last_edited_time": {"on_or_after": watermark}}
+        pages = list(iter_database_query(database_id, filter_obj))
+
+        now = time.time()
+        new_watermark = max([watermark or "", *(page.get("last_edited_time", "") for page in pages)]) or None
+        with self._lock, self._conn:
+            if full:
+                if table == "tasks":
+                    self._conn.execute("DELETE FROM task_assignees")
+                    self._conn.execute("DELETE FROM task_projects")
+                self._conn.execute(f"DELETE FROM {table}")
+            upsert(pages)
+            self._conn.execute(
+                """
+                INSERT INTO sync_state (database_id, watermark, synced_at, full_synced_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (database_id) DO UPDATE SET
+                    watermark = excluded.watermark,
+                    synced_at = excluded.synced_at,
+                    full_synced_at = COALESCE(excluded.full_synced_at, sync_state.full_synced_at)
+                """,
+                (database_id, new_watermark, now, now if full else None),
+            )
+        return len(pages)
+
+    def _upsert_tasks(self, pages: list[dict[str, Any]]) -> None:
+        """Write task pages; the caller holds the lock and the transaction."""
+        for page in pages:
+            task_id = page.get("id")
+            self._conn.execute("DELETE FROM task_assignees WHERE task_id = ?", (task_id,))
+            self._conn.execute("DELETE FROM task_projects WHERE task_id = ?", (task_id,))
+            if page.get("archived") or page.get("in_trash"):
+                self._conn.execute("DELETE FROM tasks WHERE task_id = ?", (task_id,))
+                continue
+            task = _parse_task(page)
+            self._conn.execute(
+                """
+                INSERT INTO tasks (task_id, status, last_edited_time, task)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT (task_id) DO UPDATE SET
+                    status = excluded.status,
+                    last_edited_time = excluded.last_edited_time,
+                    task = excluded.task
+                """,
+                (task_id, task["status"], page.get("last_edited_time", ""), json.dumps(task)),
+            )
+            properties = page.get("properties", {})
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO task_assignees (task_id, notion_user_id) VALUES (?, ?)",
+                [
+                    (task_id, person.get("id"))
+                    for person in properties.get("In Charge", {}).get("people", [])
+                    if person.get("id")
+                ],
+            )
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO task_projects (task_id, project_id) VALUES (?, ?)",
+                [
+                    (task_id, related.get("id"))
+                    for related in properties.get("Event/Project", {}).get("relation", [])
+                    if related.get("id")
+                ],
+            )
+
+    def _upsert_projects(self, pages: list[dict[str, Any]]) -> None:
+        for page in pages:
+            if page.get("archived") or page.get("in_trash"):
+                self._conn.execute("DELETE FROM projects WHERE project_id = ?", (page.get("id"),))
+                continue
+            self._conn.execute(
+                """
+                INSERT INTO projects (project_id, name, last_edited_time)
+                VALUES (?, ?, ?)
+                ON CONFLICT (project_id) DO UPDATE SET
+                    name = excluded.name,
+                    last_edited_time = excluded.last_edited_time
+                """,
+                (page.get("id"), _project_name(page), page.get("last_edited_time", "")),
+            )
+
+    def apply_task_page(self, page: Any) -> None:
+        """Write a task page returned by one of our own writes straight into the mirror."""
+        if isinstance(page, dict) and page.get("id") and "properties" in page:
+            with self._lock, self._conn:
+                self._upsert_tasks([page])
+
+    def is_fresh(self, database_id: str = NOTION_PRODUCTION_DATABASE_ID_TASKS) -> bool:
+        _, synced_at, _ = self._sync_state(database_id)
+        return time.time() - synced_at <= self.max_staleness_seconds
+
+    def get_active_tasks(
+        self,
+        notion_user_id: Optional[str] = None,
+        notion_project_id: Optional[str] = None,
+    ) -> dict[Any, dict[str, Any]]:
+        """Same result as notion_functions.get_active_tasks, from the local indexes."""
+        joins = []
+        params: list[Any] = []
+        if notion_user_id:
+            joins.append("JOIN task_assignees a ON a.task_id = t.task_id AND a.notion_user_id = ?")
+            params.append(notion_user_id)
+        if notion_project_id:
+            joins.append("JOIN task_projects p ON p.task_id = t.task_id AND p.project_id = ?")
+            params.append(notion_project_id)
+        placeholders = ", ".join("?" for _ in INACTIVE_TASK_STATUSES)
+        query = f"""
+            SELECT t.task_id, t.task
+            FROM tasks t
+            {' '.join(joins)}
+            WHERE COALESCE(t.status, '') NOT IN ({placeholders})
+            ORDER BY t.last_edited_time DESC
+        """
+        with self._lock:
+            rows = self._conn.execute(query, [*params, *INACTIVE_TASK_STATUSES]).fetchall()
+        return {task_id: json.loads(task) for task_id, task in rows}
+
+    def get_active_projects(self) -> project_map_type:
+        with self._lock:
+            rows = self._conn.execute("SELECT project_id, name FROM projects").fetchall()
+        return {project_id: name for project_id, name in rows}
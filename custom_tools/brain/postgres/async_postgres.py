@@ -0,0 +1,203 @@
+"""
+Async counterparts of the functions in postgres.py.
+
+The Discord handlers and llmgine tool loops run on a single event loop, so a
+blocking query there stalls every other channel. Each function here runs its
+synchronous twin on a dedicated thread pool sized to the connection pool, so
+callers can ``await`` a query while the loop keeps serving other messages.
+The synchronous API in postgres.py is unchanged and remains the single place
+where the SQL lives.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Iterable, Optional, Sequence, TypeVar
+
+from custom_tools.brain.postgres import postgres
+from custom_tools.brain.postgres.postgres import DatabaseEngine
+
+T = TypeVar("T")
+
+
+class DatabaseExecutor:
+    _executor: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def get_executor(cls) -> ThreadPoolExecutor:
+        if cls._executor is None:
+            # One worker per pooled connection: workers never queue on the pool,
+            # and excess queries wait here without occupying a connection
+            cls._executor = ThreadPoolExecutor(
+                max_workers=DatabaseEngine.pool_size() + DatabaseEngine.max_overflow(),
+                thread_name_prefix="brain-postgres",
+            )
+        return cls._executor
+
+    @classmethod
+    def shutdown(cls) -> None:
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=True)
+            cls._executor = None
+
+
+async def run_in_database_executor(
+    function: Callable[..., T], *args: Any, **kwargs: Any
+) -> T:
+    """Run a blocking database function without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        DatabaseExecutor.get_executor(), functools.partial(function, *args, **kwargs)
+    )
+
+
+async def get_user(discord_id: str) -> Optional[dict[str, Any]]:
+    return await run_in_database_executor(postgres.get_user, discord_id)
+
+
+async def get_user_fact(discord_id: str, days_back: int = 30) -> list[dict[str, Any]]:
+    return await run_in_database_executor(
+        postgres.get_user_fact, discord_id, days_back
+    )
+
+
+async def get_author_context(
+    discord_id: str, fact_limit: int = postgres.AUTHOR_CONTEXT_FACT_LIMIT
+) -> str:
+    return await run_in_database_executor(
+        postgres.get_author_context, discord_id, fact_limit
+    )
+
+
+async def set_user_fact(discord_id: str, fact_text: str) -> None:
+    await run_in_database_executor(postgres.set_user_fact, discord_id, fact_text)
+
+
+async def set_user_facts_bulk(
+    facts_by_discord_id: dict[str, list[str]],
+) -> dict[str, Any]:
+    return await run_in_database_executor(
+        postgres.set_user_facts_bulk, facts_by_discord_id
+    )
+
+
+async def get_user_facts_with_keywords(
+    discord_id: str, keywords: list[str], ranked: bool = False, top_k: int = 10
+) -> list[dict[str, Any]]:
+    return await run_in_database_executor(
+        postgres.get_user_facts_with_keywords, discord_id, keywords, ranked, top_k
+    )
+
+
+async def search_user_facts(
+    discord_id: str, keywords: list[str], top_k: int = 10
+) -> list[dict[str, Any]]:
+    return await run_in_database_executor(
+        postgres.search_user_facts, discord_id, keywords, top_k
+    )
+
+
+async def delete_fact(discord_id: str, fact_id: str) -> None:
+    await run_in_database_executor(postgres.delete_fact, discord_id, fact_id)
+
+
+async def set_initial_committee_personal_checkup() -> None:
+    await run_in_database_executor(postgres.set_initial_committee_personal_checkup)
+
+
+async def set_committee_personal_checkup(
+    discord_id: str, checkup_text: str, start_date: datetime
+) -> None:
+    await run_in_database_executor(
+        postgres.set_committee_personal_checkup, discord_id, checkup_text, start_date
+    )
+
+
+async def set_committee_personal_checkups_bulk(
+    checkups: list[tuple[str, str, datetime]],
+) -> None:
+    await run_in_database_executor(
+        postgres.set_committee_personal_checkups_bulk, checkups
+    )
+
+
+async def get_latest_personal_checkup(discord_id: str) -> str:
+    return await run_in_database_executor(
+        postgres.get_latest_personal_checkup, discord_id
+    )
+
+
+async def get_checkup_as_of(
+    discord_id: str, as_of: datetime
+) -> Optional[dict[str, Any]]:
+    return await run_in_database_executor(
+        postgres.get_checkup_as_of, discord_id, as_of
+    )
+
+
+async def get_checkups_for_discord_id(
+    discord_id: str, as_of: Optional[datetime] = None, limit: Optional[int] = None
+) -> dict[str, Any]:
+    return await run_in_database_executor(
+        postgres.get_checkups_for_discord_id, discord_id, as_of, limit
+    )
+
+
+async def get_current_personal_description(discord_id: str) -> str:
+    return await run_in_database_executor(
+        postgres.get_current_personal_description, discord_id
+    )
+
+
+async def set_personal_description(discord_id: str, personal_description: str) -> None:
+    await run_in_database_executor(
+        postgres.set_personal_description, discord_id, personal_description
+    )
+
+
+async def get_committee_member_by_notion_id(
+    notion_id: str,
+) -> Optional[dict[str, Any]]:
+    return await run_in_database_executor(
+        postgres.get_committee_member_by_notion_id, notion_id
+    )
+
+
+async def get_committee_member_by_discord_id(
+    discord_id: str,
+) -> Optional[dict[str, Any]]:
+    return await run_in_database_executor(
+        postgres.get_committee_member_by_discord_id, discord_id
+    )
+
+
+async def get_committee_member_by_discord_dm_channel_id(
+    discord_dm_channel_id: int,
+) -> Optional[dict[str, Any]]:
+    return await run_in_database_executor(
+        postgres.get_committee_member_by_discord_dm_channel_id, discord_dm_channel_id
+    )
+
+
+async def copy_records(
+    table_name: str, columns: list[str], records: Iterable[Sequence[Any]]
+) -> int:
+    return await run_in_database_executor(
+        postgres.copy_records, table_name, columns, records
+    )
+
+
+async def maintain_bus_event_partitions(
+    months_ahead: int = 2, retention_months: int = 6, keep_detached: bool = False
+) -> dict[str, int]:
+    return await run_in_database_executor(
+        postgres.maintain_bus_event_partitions,
+        months_ahead,
+        retention_months,
+        keep_detached,
+    )
+
+
+async def refresh_gold_views(concurrently: bool = True) -> None:
+    await run_in_database_executor(postgres.refresh_gold_views, concurrently)
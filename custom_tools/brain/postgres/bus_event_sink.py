@@ -0,0 +1,150 @@
+"""
+Batched writer that persists llmgine MessageBus events to silver.llmgine_bus_events.
+
+Publishing an event only enqueues it. A background task flushes the queue with
+COPY once BUS_EVENT_BATCH_SIZE events are waiting or BUS_EVENT_FLUSH_INTERVAL
+seconds have passed, whichever comes first. When the queue is full, publishers
+wait for the writer to catch up (backpressure) instead of dropping events.
+Pending events are written on stop().
+
+The sink also keeps the monthly partitions of the table created ahead of time
+and rolls up expired ones (see maintain_bus_event_partitions).
+"""
+
+import asyncio
+import dataclasses
+import json
+from datetime import datetime
+from typing import Any, Optional
+
+from llmgine.bus.bus import MessageBus
+from llmgine.messages.events import Event
+
+from custom_tools.brain.postgres.async_postgres import (
+    copy_records,
+    maintain_bus_event_partitions,
+)
+
+BUS_EVENTS_TABLE: str = "silver.llmgine_bus_events"
+BUS_EVENTS_COLUMNS: list[str] = ["event_data", "event_timestamp", "event_class_name"]
+
+BUS_EVENT_BATCH_SIZE: int = 500
+BUS_EVENT_FLUSH_INTERVAL: float = 2.0
+BUS_EVENT_QUEUE_SIZE: int = 10000
+# Partition maintenance runs on start and then at this interval
+BUS_EVENT_MAINTENANCE_INTERVAL: float = 6 * 60 * 60
+
+
+def serialize_event(event: Event) -> tuple[str, str, str]:
+    """Convert an event into a (event_data, event_timestamp, event_class_name) row."""
+    to_dict = getattr(event, "to_dict", None)
+    if callable(to_dict):
+        event_data: Any = to_dict()
+    elif dataclasses.is_dataclass(event):
+        event_data = dataclasses.asdict(event)
+    else:
+        event_data = vars(event)
+
+    timestamp = getattr(event, "timestamp", None)
+    if isinstance(timestamp, datetime):
+        timestamp = timestamp.isoformat()
+    return (
+        json.dumps(event_data, default=str),
+        timestamp or datetime.now().isoformat(),
+        type(event).__name__,
+    )
+
+
+class BusEventSink:
+    def __init__(
+        self,
+        batch_size: int = BUS_EVENT_BATCH_SIZE,
+        flush_interval: float = BUS_EVENT_FLUSH_INTERVAL,
+        queue_size: int = BUS_EVENT_QUEUE_SIZE,
+    ) -> None:
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue: asyncio.Queue[tuple[str, str, str]] = asyncio.Queue(
+            maxsize=queue_size
+        )
+        self.events_written: int = 0
+        self.flush_failures: int = 0
+        self._writer_task: Optional[asyncio.Task[None]] = None
+        self._maintenance_task: Optional[asyncio.Task[None]] = None
+        self._stopping = asyncio.Event()
+
+    def attach(self, bus: MessageBus, event_types: list[type[Event]]) -> None:
+        """Persist every published event of the given types."""
+        for event_type in event_types:
+            bus.register_event_handler(event_type, self.handle_event)
+
+    async def handle_event(self, event: Event) -> None:
+        """Bus event handler: enqueue the event, waiting if the queue is full."""
+        await self.queue.put(serialize_event(event))
+
+    async def start(self) -> None:
+        if self._writer_task is None:
+            self._stopping.clear()
+            self._writer_task = asyncio.create_task(self._run())
+            self._maintenance_task = asyncio.create_task(self._maintain_partitions())
+
+    async def stop(self) -> None:
+        """Stop the writer after flushing every pending event."""
+        if self._writer_task is None:
+            return
+        self._stopping.set()
+        if self._maintenance_task is not None:
+            self._maintenance_task.cancel()
+            self._maintenance_task = None
+        await self._writer_task
+        self._writer_task = None
+
+    async def _maintain_partitions(self) -> None:
+        while True:
+            try:
+                result = await maintain_bus_event_partitions()
+                if result["created"] or result["rolled_up"]:
+                    print(
+                        f"Bus event partitions: {result['created']} created, "
+                        f"{result['rolled_up']} rolled up"
+                    )
+            except Exception as e:
+                print(f"Failed to maintain bus event partitions: {e}")
+            await asyncio.sleep(BUS_EVENT_MAINTENANCE_INTERVAL)
+
+    async def _run(self) -> None:
+        while not (self._stopping.is_set() and self.queue.empty()):
+            batch = await self._next_batch()
+            if batch:
+                await self._flush(batch)
+
+    async def _next_batch(self) -> list[tuple[str, str, str]]:
+        """Collect up to batch_size events, waiting at most flush_interval."""
+        batch: list[tuple[str, str, str]] = []
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            if self._stopping.is_set():
+                # Draining: take whatever is already queued without waiting
+                if self.queue.empty():
+                    break
+                batch.append(self.queue.get_nowait())
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _flush(self, batch: list[tuple[str, str, str]]) -> None:
+        try:
+            self.events_written += await copy_records(
+                BUS_EVENTS_TABLE, BUS_EVENTS_COLUMNS, batch
+            )
+        except Exception as e:
+            # Losing a batch of telemetry must never take the bot down
+            self.flush_failures += 1
+            print(f"Failed to write {len(batch)} bus events: {e}")
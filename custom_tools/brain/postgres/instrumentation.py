@@ -0,0 +1,311 @@
+"""
+Opt-in latency instrumentation for the brain Postgres layer.
+
+Enable it with DatabaseEngine.enable_instrumentation() (or DB_INSTRUMENTATION=1).
+Once enabled it records:
+- latency per postgres.py function (functions decorated with @instrumented)
+- latency and rows returned per SQL statement, via cursor execute events
+- time spent waiting for a pooled connection
+
+Read the data with QueryMetrics.snapshot(), or let MetricsDumper write the
+snapshot to a local JSON file periodically.
+"""
+
+import bisect
+import contextvars
+import functools
+import json
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+
+T = TypeVar("T")
+
+# Upper bounds of the latency buckets in milliseconds; the last bucket is open-ended
+LATENCY_BUCKETS_MS: list[float] = [
+    1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000,
+]
+# Statements are keyed by their normalized text, truncated to this length
+STATEMENT_KEY_MAX_LENGTH: int = 200
+
+_current_function: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "brain_postgres_current_function", default=None
+)
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with count, total and max."""
+
+    def __init__(self) -> None:
+        self.bucket_counts: list[int] = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count: int = 0
+        self.total_ms: float = 0.0
+        self.max_ms: float = 0.0
+        self.rows: int = 0
+
+    def record(self, latency_ms: float, rows: int = 0) -> None:
+        self.bucket_counts[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+        self.count += 1
+        self.total_ms += latency_ms
+        self.max_ms = max(self.max_ms, latency_ms)
+        self.rows += max(rows, 0)
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given fraction of samples."""
+        if self.count == 0:
+            return 0.0
+        threshold = fraction * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.bucket_counts):
+            seen += bucket_count
+            if seen >= threshold:
+                if index < len(LATENCY_BUCKETS_MS):
+                    return min(LATENCY_BUCKETS_MS[index], self.max_ms)
+                return self.max_ms
+        return self.max_ms
+
+    def to_dict(self) -> dict[str, Any]:
+        buckets = {
+            f"le_{bound:g}ms": count
+            for bound, count in zip(LATENCY_BUCKETS_MS, self.bucket_counts)
+        }
+        buckets["inf"] = self.bucket_counts[-1]
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 3),
+            "rows": self.rows,
+            "buckets": buckets,
+        }
+
+
+class QueryMetrics:
+    """Process-wide store of query latency histograms."""
+
+    _enabled: bool = False
+    _enabled_since: Optional[datetime] = None
+    _functions: dict[str, LatencyHistogram] = {}
+    _statements: dict[str, LatencyHistogram] = {}
+    _statement_functions: dict[str, set[str]] = {}
+    _pool_wait: LatencyHistogram = LatencyHistogram()
+    _lock = threading.Lock()
+
+    @classmethod
+    def enable(cls) -> None:
+        with cls._lock:
+            if not cls._enabled:
+                cls._enabled = True
+                cls._enabled_since = datetime.now()
+
+    @classmethod
+    def disable(cls) -> None:
+        with cls._lock:
+            cls._enabled = False
+
+    @classmethod
+    def is_enabled(cls) -> bool:
+        return cls._enabled
+
+    @classmethod
+    def reset(cls) -> None:
+        with cls._lock:
+            cls._functions = {}
+            cls._statements = {}
+            cls._statement_functions = {}
+            cls._pool_wait = LatencyHistogram()
+            cls._enabled_since = datetime.now() if cls._enabled else None
+
+    @classmethod
+    def record_function(cls, function_name: str, latency_ms: float) -> None:
+        with cls._lock:
+            cls._functions.setdefault(function_name, LatencyHistogram()).record(
+                latency_ms
+            )
+
+    @classmethod
+    def record_statement(cls, statement: str, latency_ms: float, rows: int) -> None:
+        key = normalize_statement(statement)
+        function_name = _current_function.get()
+        with cls._lock:
+            cls._statements.setdefault(key, LatencyHistogram()).record(
+                latency_ms, rows
+            )
+            if function_name:
+                cls._statement_functions.setdefault(key, set()).add(function_name)
+
+    @classmethod
+    def record_pool_wait(cls, wait_ms: float) -> None:
+        with cls._lock:
+            cls._pool_wait.record(wait_ms)
+
+    @classmethod
+    def snapshot(cls, engine: Optional[Engine] = None) -> dict[str, Any]:
+        """Return a JSON-serializable copy of every histogram collected so far."""
+        with cls._lock:
+            snapshot: dict[str, Any] = {
+                "taken_at": datetime.now().isoformat(),
+                "enabled_since": (
+                    cls._enabled_since.isoformat() if cls._enabled_since else None
+                ),
+                "functions": {
+                    name: histogram.to_dict()
+                    for name, histogram in sorted(cls._functions.items())
+                },
+                "statements": {
+                    statement: {
+                        **histogram.to_dict(),
+                        "functions": sorted(
+                            cls._statement_functions.get(statement, ())
+                        ),
+                    }
+                    for statement, histogram in sorted(
+                        cls._statements.items(),
+                        key=lambda item: item[1].total_ms,
+                        reverse=True,
+                    )
+                },
+                "pool_wait": cls._pool_wait.to_dict(),
+            }
+        if engine is not None and isinstance(engine.pool, QueuePool):
+            snapshot["pool"] = {
+                "size": engine.pool.size(),
+                "checked_out": engine.pool.checkedout(),
+                "overflow": engine.pool.overflow(),
+            }
+        return snapshot
+
+
+def normalize_statement(statement: str) -> str:
+    return re.sub(r"\s+", " ", statement).strip()[:STATEMENT_KEY_MAX_LENGTH]
+
+
+def instrumented(function: Callable[..., T]) -> Callable[..., T]:
+    """Record the latency of a database function and attribute its statements to it."""
+
+    @functools.wraps(function)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        if not QueryMetrics.is_enabled():
+            return function(*args, **kwargs)
+        token = _current_function.set(function.__qualname__)
+        start = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            QueryMetrics.record_function(
+                function.__qualname__, (time.perf_counter() - start) * 1000
+            )
+            _current_function.reset(token)
+
+    return wrapper
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def connect(self):  # type: ignore[override]
+        if not QueryMetrics.is_enabled():
+            return super().connect()
+        start = time.perf_counter()
+        connection = super().connect()
+        QueryMetrics.record_pool_wait((time.perf_counter() - start) * 1000)
+        return connection
+
+
+def _before_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    if not QueryMetrics.is_enabled():
+        return
+    conn.info.setdefault("brain_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(
+    conn: Any,
+    cursor: Any,
+    statement: str,
+    parameters: Any,
+    context: Any,
+    executemany: bool,
+) -> None:
+    starts = conn.info.get("brain_query_start")
+    if not starts:
+        return
+    latency_ms = (time.perf_counter() - starts.pop()) * 1000
+    if QueryMetrics.is_enabled():
+        QueryMetrics.record_statement(statement, latency_ms, cursor.rowcount)
+
+
+def _handle_error(exception_context: Any) -> None:
+    # A failed statement never reaches after_cursor_execute; drop its start time
+    # so it does not pair with a later statement on this pooled connection
+    conn = exception_context.connection
+    if conn is None:
+        return
+    starts = conn.info.get("brain_query_start")
+    if starts:
+        starts.pop()
+
+
+def attach_statement_listeners(engine: Engine) -> None:
+    """Register the cursor execute hooks on an engine (idempotent)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+class MetricsDumper:
+    """Background thread that periodically writes QueryMetrics.snapshot() to a file."""
+
+    def __init__(
+        self,
+        path: Path,
+        interval_seconds: float,
+        engine_provider: Callable[[], Optional[Engine]],
+    ) -> None:
+        self.path = path
+        self.interval_seconds = interval_seconds
+        self.engine_provider = engine_provider
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, name="brain-postgres-metrics", daemon=True
+        )
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.dump()
+
+    def dump(self) -> None:
+        snapshot = QueryMetrics.snapshot(self.engine_provider())
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so readers never see a half-written file
+        temp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        temp_path.write_text(json.dumps(snapshot, indent=2, default=str))
+        temp_path.replace(self.path)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_seconds):
+            try:
+                self.dump()
+            except Exception as e:
+                print(f"Failed to dump database metrics to {self.path}: {e}")
@@ -1,15 +1,44 @@
+import csv
+import io
 import os
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Any, Optional
+from typing import Any, Iterable, Optional, Sequence
 from pathlib import Path
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, text
-from sqlalchemy.engine import Engine
+from sqlalchemy import bindparam, create_engine, text
+from sqlalchemy.engine import Connection, Engine
+
+from custom_tools.brain.postgres.instrumentation import (
+    MetricsDumper,
+    QueryMetrics,
+    TimedQueuePool,
+    attach_statement_listeners,
+    instrumented,
+)
+
+# Pool tuning. The bot serves many channels concurrently and the async variants
+# in async_postgres.py dispatch onto a thread pool of the same size, so the pool
+# must be large enough for every worker to hold a connection at once.
+DEFAULT_POOL_SIZE: int = 10
+DEFAULT_MAX_OVERFLOW: int = 5
+DEFAULT_POOL_TIMEOUT_SECONDS: int = 10
+DEFAULT_POOL_RECYCLE_SECONDS: int = 1800
+DEFAULT_STATEMENT_TIMEOUT_MS: int = 5000
+DEFAULT_CONNECT_TIMEOUT_SECONDS: int = 5
+DEFAULT_METRICS_DUMP_INTERVAL_SECONDS: int = 60
+
+
+def _env_int(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
 
 
 class DatabaseEngine:
     _engine: Optional[Engine] = None
+    _metrics_dumper: Optional[MetricsDumper] = None
 
     @classmethod
     def get_engine(cls) -> Engine:
@@ -21,10 +50,191 @@ class DatabaseEngine:
             database_url = os.getenv("DATABASE_URL")
             if not database_url:
                 raise ValueError("DATABASE_URL is not set.")
-            cls._engine = create_engine(database_url)
+            statement_timeout_ms = _env_int(
+                "DB_STATEMENT_TIMEOUT_MS", DEFAULT_STATEMENT_TIMEOUT_MS
+            )
+            cls._engine = create_engine(
+                database_url,
+                # Records pool wait time while instrumentation is enabled
+                poolclass=TimedQueuePool,
+                pool_size=cls.pool_size(),
+                max_overflow=cls.max_overflow(),
+                pool_timeout=_env_int(
+                    "DB_POOL_TIMEOUT_SECONDS", DEFAULT_POOL_TIMEOUT_SECONDS
+                ),
+                pool_recycle=_env_int(
+                    "DB_POOL_RECYCLE_SECONDS", DEFAULT_POOL_RECYCLE_SECONDS
+                ),
+                # Drop connections the server has closed instead of failing the query
+                pool_pre_ping=True,
+                connect_args={
+                    "connect_timeout": _env_int(
+                        "DB_CONNECT_TIMEOUT_SECONDS", DEFAULT_CONNECT_TIMEOUT_SECONDS
+                    ),
+                    # A runaway query must not hold a pooled connection forever
+                    "options": f"-c statement_timeout={statement_timeout_ms}",
+                },
+            )
+            attach_statement_listeners(cls._engine)
+            if os.getenv("DB_INSTRUMENTATION", "").lower() in ("1", "true", "yes"):
+                dump_path = os.getenv("DB_METRICS_DUMP_PATH")
+                cls.enable_instrumentation(
+                    Path(dump_path) if dump_path else None,
+                    _env_int(
+                        "DB_METRICS_DUMP_INTERVAL_SECONDS",
+                        DEFAULT_METRICS_DUMP_INTERVAL_SECONDS,
+                    ),
+                )
         return cls._engine
 
+    @classmethod
+    def pool_size(cls) -> int:
+        return _env_int("DB_POOL_SIZE", DEFAULT_POOL_SIZE)
+
+    @classmethod
+    def max_overflow(cls) -> int:
+        return _env_int("DB_MAX_OVERFLOW", DEFAULT_MAX_OVERFLOW)
+
+    @classmethod
+    def enable_instrumentation(
+        cls,
+        dump_path: Optional[Path] = None,
+        dump_interval_seconds: int = DEFAULT_METRICS_DUMP_INTERVAL_SECONDS,
+    ) -> None:
+        """
+        Start recording per-function and per-statement latency, rows returned
+        and pool wait time.
+
+        Args:
+            dump_path: If given, write a JSON snapshot to this file periodically
+            dump_interval_seconds: Seconds between snapshots written to dump_path
+        """
+        QueryMetrics.enable()
+        if dump_path is not None and cls._metrics_dumper is None:
+            cls._metrics_dumper = MetricsDumper(
+                dump_path, dump_interval_seconds, lambda: cls._engine
+            )
+            cls._metrics_dumper.start()
+
+    @classmethod
+    def disable_instrumentation(cls) -> None:
+        """Stop recording and write a final snapshot if dumping was enabled."""
+        QueryMetrics.disable()
+        if cls._metrics_dumper is not None:
+            cls._metrics_dumper.stop()
+            cls._metrics_dumper = None
+
+    @classmethod
+    def metrics_snapshot(cls) -> dict[str, Any]:
+        """Return the latency histograms collected since instrumentation was enabled."""
+        return QueryMetrics.snapshot(cls._engine)
+
+    @classmethod
+    def dispose(cls) -> None:
+        """Close every pooled connection, e.g. on shutdown or after a fork."""
+        if cls._engine is not None:
+            cls._engine.dispose()
+            cls._engine = None
+
+
+# silver.committee changes about once a term, so it is served from memory.
+DEFAULT_COMMITTEE_CACHE_TTL_SECONDS: int = 600
+# A lookup miss may be a member added since the last load. Reload on a miss,
+# but no more often than this so unknown ids cannot hammer the database.
+COMMITTEE_MISS_REFRESH_INTERVAL_SECONDS: int = 30
+
+
+class CommitteeDirectory:
+    """
+    In-process directory of silver.committee with O(1) lookups by Discord ID,
+    Notion ID and Discord DM channel ID.
+
+    The whole table is loaded in one query and reloaded once the TTL expires.
+    Call invalidate() after changing silver.committee to force a reload.
+    """
+
+    _by_discord_id: dict[str, dict[str, Any]] = {}
+    _by_notion_id: dict[str, dict[str, Any]] = {}
+    _by_discord_dm_channel_id: dict[int, dict[str, Any]] = {}
+    _loaded_at: Optional[float] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def ttl_seconds(cls) -> int:
+        return _env_int(
+            "COMMITTEE_CACHE_TTL_SECONDS", DEFAULT_COMMITTEE_CACHE_TTL_SECONDS
+        )
+
+    @classmethod
+    @instrumented
+    def refresh(cls) -> None:
+        """Reload the directory from silver.committee."""
+        engine = DatabaseEngine.get_engine()
+        query = text("""
+            SELECT member_id, name, notion_id, discord_id, discord_dm_channel_id, ingestion_timestamp
+            FROM silver.committee
+        """)
+        with engine.connect() as conn:
+            members = [dict(row) for row in conn.execute(query).mappings().all()]
+
+        by_discord_id: dict[str, dict[str, Any]] = {}
+        by_notion_id: dict[str, dict[str, Any]] = {}
+        by_discord_dm_channel_id: dict[int, dict[str, Any]] = {}
+        for member in members:
+            if member["discord_id"] is not None:
+                by_discord_id[str(member["discord_id"])] = member
+            if member["notion_id"]:
+                by_notion_id[member["notion_id"]] = member
+            if member["discord_dm_channel_id"] is not None:
+                by_discord_dm_channel_id[int(member["discord_dm_channel_id"])] = member
+
+        with cls._lock:
+            cls._by_discord_id = by_discord_id
+            cls._by_notion_id = by_notion_id
+            cls._by_discord_dm_channel_id = by_discord_dm_channel_id
+            cls._loaded_at = time.monotonic()
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop the cached directory; the next lookup reloads it."""
+        with cls._lock:
+            cls._loaded_at = None
+
+    @classmethod
+    def _age(cls) -> Optional[float]:
+        if cls._loaded_at is None:
+            return None
+        return time.monotonic() - cls._loaded_at
+
+    @classmethod
+    def _lookup(cls, index_name: str, key: Any) -> Optional[dict[str, Any]]:
+        age = cls._age()
+        if age is None or age > cls.ttl_seconds():
+            cls.refresh()
+        member = getattr(cls, index_name).get(key)
+        if member is None:
+            age = cls._age()
+            if age is None or age > COMMITTEE_MISS_REFRESH_INTERVAL_SECONDS:
+                cls.refresh()
+                member = getattr(cls, index_name).get(key)
+        return dict(member) if member else None
+
+    @classmethod
+    def get_by_discord_id(cls, discord_id: str | int) -> Optional[dict[str, Any]]:
+        return cls._lookup("_by_discord_id", str(discord_id))
+
+    @classmethod
+    def get_by_notion_id(cls, notion_id: str) -> Optional[dict[str, Any]]:
+        return cls._lookup("_by_notion_id", notion_id)
 
+    @classmethod
+    def get_by_discord_dm_channel_id(
+        cls, discord_dm_channel_id: str | int
+    ) -> Optional[dict[str, Any]]:
+        return cls._lookup("_by_discord_dm_channel_id", int(discord_dm_channel_id))
+
+
+@instrumented
 def get_user(discord_id: str) -> Optional[dict[str, Any]]:
     engine = DatabaseEngine.get_engine()
     query = text("""
@@ -39,13 +249,16 @@ def get_user(discord_id: str) -> Optional[dict[str, Any]]:
         return dict(user) if user else None
 
 
+@instrumented
 def get_user_fact(discord_id: str, days_back: int = 30) -> list[dict[str, Any]]:
     engine = DatabaseEngine.get_engine()
     days_ago = datetime.now() - timedelta(days=days_back)
-    query = text("""
-        SELECT f.*
-        FROM gold.all_facts f
-        JOIN gold.users_base u ON f.user_name = u.name
+    # Read from silver so facts the bot just wrote or deleted are seen
+    # immediately; idx_fact_user_id_created_at serves the ordered per-user read
+    query = text(f"""
+        SELECT {USER_FACT_COLUMNS}
+        FROM silver.fact f
+        JOIN silver.user u ON u.id = f.user_id
         WHERE u.discord_id = :discord_id
           AND f.created_at >= :days_ago
         ORDER BY f.created_at DESC
@@ -56,6 +269,70 @@ def get_user_fact(discord_id: str, days_back: int = 30) -> list[dict[str, Any]]:
         return [dict(fact) for fact in facts]
 
 
+# Columns of a fact row, as in the gold.all_facts view
+USER_FACT_COLUMNS: str = (
+    "f.fact_id, f.user_id, u.discord_id, u.name AS user_name, f.fact_text, f.created_at"
+)
+
+
+# Number of most recent facts included in the author context of a mention
+AUTHOR_CONTEXT_FACT_LIMIT: int = 10
+
+
+@instrumented
+def get_author_context(
+    discord_id: str, fact_limit: int = AUTHOR_CONTEXT_FACT_LIMIT
+) -> str:
+    """
+    Fetch a user's row and latest facts in one round trip and render them as a
+    compact, prompt-ready string.
+
+    Args:
+        discord_id: Discord ID of the user
+        fact_limit: Maximum number of most recent facts to include
+
+    Returns:
+        The user's non-empty fields and latest facts, one fact per line
+    """
+    engine = DatabaseEngine.get_engine()
+    query = text("""
+        SELECT
+            to_jsonb(u) AS user_row,
+            COALESCE(
+                (
+                    SELECT jsonb_agg(latest.fact_text ORDER BY latest.created_at DESC)
+                    FROM (
+                        SELECT f.fact_text, f.created_at
+                        FROM silver.fact f
+                        WHERE f.user_id = u.id
+                        ORDER BY f.created_at DESC
+                        LIMIT :fact_limit
+                    ) latest
+                ),
+                CAST('[]' AS JSONB)
+            ) AS facts
+        FROM silver.user u
+        WHERE u.discord_id = :discord_id
+        LIMIT 1
+    """)
+    with engine.connect() as conn:
+        row = conn.execute(
+            query, {"discord_id": discord_id, "fact_limit": fact_limit}
+        ).first()
+
+    if row is None:
+        return "No stored info or facts about this user."
+
+    user_fields = "; ".join(
+        f"{key}: {value}"
+        for key, value in row.user_row.items()
+        if value not in (None, "")
+    )
+    facts = "\n".join(f"- {fact}" for fact in row.facts) or "(none)"
+    return f"Info: {user_fields}\nFacts:\n{facts}"
+
+
+@instrumented
 def set_user_fact(discord_id: str, fact_text: str) -> None:
     engine = DatabaseEngine.get_engine()
     user_query = text("""
@@ -73,20 +350,121 @@ def set_user_fact(discord_id: str, fact_text: str) -> None:
         insert_query = text("""
             INSERT INTO silver.fact (user_id, fact_text)
             VALUES (:user_id, :fact_text)
+            ON CONFLICT (user_id, fact_hash) DO NOTHING
         """)
-        conn.execute(insert_query, {"user_id": user_id, "fact_text": fact_text})
+        result = conn.execute(insert_query, {"user_id": user_id, "fact_text": fact_text})
+    if result.rowcount:
         print(f"✅ Inserted fact for user {discord_id}")
+    else:
+        print(f"ℹ️  Skipped duplicate fact for user {discord_id}")
+
+
+# Rows per INSERT statement in set_user_facts_bulk; all chunks share one transaction
+FACT_INSERT_CHUNK_SIZE: int = 5000
+
+
+@instrumented
+def set_user_facts_bulk(facts_by_discord_id: dict[str, list[str]]) -> dict[str, Any]:
+    """
+    Insert many facts for many users in a single transaction.
+
+    User ids are resolved in one query. Facts that are exact duplicates of an
+    existing fact for the same user (ignoring case and whitespace) are skipped
+    via the unique index on (user_id, fact_hash).
+
+    Args:
+        facts_by_discord_id: Mapping of Discord ID to the facts to store for that user
+
+    Returns:
+        Dictionary with the number of facts inserted, the number skipped as
+        duplicates, and the Discord IDs that have no silver.user row
+    """
+    discord_ids = [
+        discord_id for discord_id, facts in facts_by_discord_id.items() if facts
+    ]
+    if not discord_ids:
+        return {"inserted": 0, "duplicates": 0, "unknown_discord_ids": []}
 
+    engine = DatabaseEngine.get_engine()
+    user_query = text("""
+        SELECT id, discord_id
+        FROM silver.user
+        WHERE discord_id IN :discord_ids
+    """).bindparams(bindparam("discord_ids", expanding=True))
+    insert_query = text("""
+        INSERT INTO silver.fact (user_id, fact_text)
+        SELECT user_id, fact_text
+        FROM unnest(CAST(:user_ids AS BIGINT[]), CAST(:fact_texts AS TEXT[]))
+            AS incoming(user_id, fact_text)
+        ON CONFLICT (user_id, fact_hash) DO NOTHING
+    """)
 
+    with engine.begin() as conn:
+        user_rows = conn.execute(user_query, {"discord_ids": discord_ids}).fetchall()
+        user_ids = {str(row.discord_id): row.id for row in user_rows}
+
+        rows: list[tuple[int, str]] = []
+        for discord_id in discord_ids:
+            user_id = user_ids.get(str(discord_id))
+            if user_id is None:
+                continue
+            rows.extend(
+                (user_id, fact_text) for fact_text in facts_by_discord_id[discord_id]
+            )
+
+        inserted = 0
+        for offset in range(0, len(rows), FACT_INSERT_CHUNK_SIZE):
+            chunk = rows[offset : offset + FACT_INSERT_CHUNK_SIZE]
+            result = conn.execute(
+                insert_query,
+                {
+                    "user_ids": [user_id for user_id, _ in chunk],
+                    "fact_texts": [fact_text for _, fact_text in chunk],
+                },
+            )
+            inserted += result.rowcount
+
+    unknown_discord_ids = [
+        discord_id for discord_id in discord_ids if str(discord_id) not in user_ids
+    ]
+    print(
+        f"✅ Inserted {inserted} facts for {len(user_ids)} users "
+        f"({len(rows) - inserted} duplicates skipped, "
+        f"{len(unknown_discord_ids)} unknown users)"
+    )
+    return {
+        "inserted": inserted,
+        "duplicates": len(rows) - inserted,
+        "unknown_discord_ids": unknown_discord_ids,
+    }
+
+
+@instrumented
 def get_user_facts_with_keywords(
-    discord_id: str, keywords: list[str]
+    discord_id: str, keywords: list[str], ranked: bool = False, top_k: int = 10
 ) -> list[dict[str, Any]]:
+    """
+    Fetch a user's facts that mention any of the keywords.
+
+    Args:
+        discord_id: Discord ID of the user
+        keywords: Keywords to match against the fact text
+        ranked: If True, use full-text and trigram search and return only the
+            top_k most relevant facts, each with a "score" key
+        top_k: Maximum number of facts to return in ranked mode
+
+    Returns:
+        List of fact dictionaries, newest first, or most relevant first when ranked
+    """
+    if ranked:
+        return search_user_facts(discord_id, keywords, top_k)
+
     engine = DatabaseEngine.get_engine()
     processed_keywords = [f"%{keyword}%" for keyword in keywords]
-    query = text("""
-        SELECT f.*
-        FROM gold.all_facts f
-        JOIN gold.users_base u ON f.user_name = u.name
+    query = text(f"""
+        SELECT {USER_FACT_COLUMNS}
+        FROM silver.fact f
+        JOIN silver.user u ON u.id = f.user_id
         WHERE u.discord_id = :discord_id AND f.fact_text LIKE ANY(:keywords)
         ORDER BY f.created_at DESC
     """)
@@ -98,6 +476,78 @@ def get_user_facts_with_keywords(
         return [dict(fact) for fact in facts]
 
 
+@instrumented
+def search_user_facts(
+    discord_id: str, keywords: list[str], top_k: int = 10
+) -> list[dict[str, Any]]:
+    """
+    Ranked fact search backed by the tsvector and trigram indexes on silver.fact
+    (see brain/silver/src/DDL/fact_search.sql).
+
+    A fact matches if any keyword matches its stemmed text or is a close fuzzy
+    match for one of its words. Both signals are scaled to 0-1 before they are
+    combined: the full-text rank with normalization 32 (rank / (rank + 1)) and
+    the best trigram word similarity as is. A stemmed match scores 0.5 plus
+    half its rank, and half the trigram similarity is added on top, so a
+    stemmed match always outranks a fuzzy-only one.
+
+    Args:
+        discord_id: Discord ID of the user
+        keywords: Keywords to search for
+        top_k: Maximum number of facts to return
+
+    Returns:
+        List of fact dictionaries with fact_id, fact_text, created_at and score,
+        most relevant first
+    """
+    keywords = [keyword.strip() for keyword in keywords if keyword.strip()]
+    if not keywords:
+        return []
+
+    engine = DatabaseEngine.get_engine()
+    query = text("""
+        WITH search AS (
+            SELECT websearch_to_tsquery('english', :query_text) AS tsq
+        )
+        SELECT
+            f.fact_id,
+            f.fact_text,
+            f.created_at,
+            CASE
+                WHEN f.fact_tsv @@ search.tsq
+                THEN 0.5 + 0.5 * ts_rank_cd(f.fact_tsv, search.tsq, 32)
+                ELSE 0
+            END
+            + 0.5 * (
+                SELECT MAX(word_similarity(keyword, f.fact_text))
+                FROM unnest(CAST(:keywords AS TEXT[])) AS keyword
+            ) AS score
+        FROM silver.fact f
+        JOIN silver.user u ON u.id = f.user_id
+        CROSS JOIN search
+        WHERE u.discord_id = :discord_id
+        AND (
+            f.fact_tsv @@ search.tsq
+            OR f.fact_text %> ANY(CAST(:keywords AS TEXT[]))
+        )
+        ORDER BY score DESC, f.created_at DESC
+        LIMIT :top_k
+    """)
+    with engine.connect() as conn:
+        result = conn.execute(
+            query,
+            {
+                "discord_id": discord_id,
+                # websearch syntax: "a or b" matches either keyword, like LIKE ANY
+                "query_text": " or ".join(keywords),
+                "keywords": keywords,
+                "top_k": top_k,
+            },
+        )
+        return [dict(fact) for fact in result.mappings().all()]
+
+
+@instrumented
 def delete_fact(discord_id: str, fact_id: str) -> None:
     engine = DatabaseEngine.get_engine()
     user_query = text("""
@@ -120,6 +570,7 @@ def delete_fact(discord_id: str, fact_id: str) -> None:
         print(f"✅ Deleted fact for user {discord_id}")
 
 
+@instrumented
 def set_initial_committee_personal_checkup() -> None:
     """
     Initialize committee personal checkup rows for each committee member.
@@ -158,12 +609,69 @@ def set_initial_committee_personal_checkup() -> None:
             print("ℹ️  All committee members already have active checkup records")
 
 
+def _apply_personal_checkups(
+    conn: Connection, checkups: list[tuple[dict[str, Any], str, datetime]]
+) -> tuple[int, int]:
+    """
+    Apply SCD2 checkup rows for many committee members in a single statement.
+
+    For every member the current row is closed at the new start_date and a new
+    current row is inserted carrying forward the closed row's personal_description.
+    Relies on the partial unique index on (member_id) WHERE is_current.
+
+    Returns:
+        Tuple of (rows inserted, previous rows closed)
+    """
+    query = text("""
+        WITH incoming AS (
+            SELECT *
+            FROM unnest(
+                CAST(:member_ids AS BIGINT[]),
+                CAST(:committee_names AS TEXT[]),
+                CAST(:checkup_texts AS TEXT[]),
+                CAST(:start_dates AS TIMESTAMP[])
+            ) AS i(member_id, committee_name, checkup_text, start_date)
+        ),
+        closed AS (
+            UPDATE silver.committee_personal_checkup cpc
+            SET end_date = i.start_date, is_current = FALSE
+            FROM incoming i
+            WHERE cpc.member_id = i.member_id
+            AND cpc.is_current = TRUE
+            RETURNING cpc.member_id, cpc.personal_description
+        ),
+        inserted AS (
+            INSERT INTO silver.committee_personal_checkup
+            (member_id, committee_name, personal_description, checkup_text, start_date, end_date, is_current)
+            SELECT i.member_id, i.committee_name, c.personal_description, i.checkup_text, i.start_date, '9999-12-31', TRUE
+            FROM incoming i
+            LEFT JOIN closed c ON c.member_id = i.member_id
+            RETURNING member_id
+        )
+        SELECT
+            (SELECT COUNT(*) FROM inserted) AS inserted_count,
+            (SELECT COUNT(*) FROM closed) AS closed_count
+    """)
+    result = conn.execute(
+        query,
+        {
+            "member_ids": [committee["member_id"] for committee, _, _ in checkups],
+            "committee_names": [committee["name"] for committee, _, _ in checkups],
+            "checkup_texts": [checkup_text for _, checkup_text, _ in checkups],
+            "start_dates": [start_date for _, _, start_date in checkups],
+        },
+    ).one()
+    return result.inserted_count, result.closed_count
+
+
+@instrumented
 def set_committee_personal_checkup(
     discord_id: str, checkup_text: str, start_date: datetime
 ) -> None:
     """
     Add a new checkup row for a committee member identified by discord_id.
     This function follows SCD2 pattern by ending the current active record and creating a new one.
+    The current personal_description is carried forward to the new record.
 
     Args:
         discord_id: Discord ID of the committee member
@@ -173,98 +681,71 @@ def set_committee_personal_checkup(
     engine = DatabaseEngine.get_engine()
 
     # First, find the member_id for the given discord_id
-    committee_query = text("""
-        SELECT member_id, name
-        FROM silver.committee
-        WHERE discord_id = :discord_id
-        LIMIT 1
-    """)
+    committee = CommitteeDirectory.get_by_discord_id(discord_id)
+    if not committee:
+        raise ValueError(f"No committee member found with discord_id {discord_id}")
 
     with engine.begin() as conn:
-        # Get committee info
-        committee_result = conn.execute(committee_query, {"discord_id": discord_id})
-        committee = committee_result.fetchone()
-
-        if not committee:
-            raise ValueError(f"No committee member found with discord_id {discord_id}")
-
-        member_id = committee.member_id
-        committee_name = committee.name
+        _, closed_count = _apply_personal_checkups(
+            conn, [(committee, checkup_text, start_date)]
+        )
 
-        # End the current active record (if it exists)
-        end_current_query = text("""
-            UPDATE silver.committee_personal_checkup
-            SET end_date = :start_date, is_current = FALSE
-            WHERE member_id = :member_id 
-            AND is_current = TRUE
-        """)
+    print(
+        f"✅ Added checkup for committee member {committee['name']} (ID: {committee['member_id']})"
+    )
+    if closed_count > 0:
+        print(f"   Ended previous active record and created new one")
+    else:
+        print(f"   Created first checkup record for this member")
 
-        end_result = conn.execute(
-            end_current_query, {"member_id": member_id, "start_date": start_date}
-        )
 
-        # Get the personal_description from the current active record (if it exists)
-        personal_desc_query = text("""
-            SELECT personal_description
-            FROM silver.committee_personal_checkup
-            WHERE member_id = :member_id AND is_current = TRUE
-            LIMIT 1
-        """)
+@instrumented
+def set_committee_personal_checkups_bulk(
+    checkups: list[tuple[str, str, datetime]],
+) -> None:
+    """
+    Add new checkup rows for many committee members in one statement.
+    Follows the same SCD2 pattern as set_committee_personal_checkup.
 
-        personal_desc_result = conn.execute(
-            personal_desc_query, {"member_id": member_id}
-        )
-        personal_desc_row = personal_desc_result.fetchone()
-        personal_description = (
-            personal_desc_row.personal_description if personal_desc_row else None
-        )
+    Args:
+        checkups: List of (discord_id, checkup_text, start_date) tuples, at most one per member
+    """
+    resolved: list[tuple[dict[str, Any], str, datetime]] = []
+    seen_member_ids: set[int] = set()
+    for discord_id, checkup_text, start_date in checkups:
+        committee = CommitteeDirectory.get_by_discord_id(discord_id)
+        if not committee:
+            raise ValueError(f"No committee member found with discord_id {discord_id}")
+        if committee["member_id"] in seen_member_ids:
+            raise ValueError(f"Multiple checkups given for discord_id {discord_id}")
+        seen_member_ids.add(committee["member_id"])
+        resolved.append((committee, checkup_text, start_date))
 
-        # Insert the new checkup record
-        insert_query = text("""
-            INSERT INTO silver.committee_personal_checkup 
-            (member_id, committee_name, personal_description, checkup_text, start_date, end_date, is_current)
-            VALUES (:member_id, :committee_name, :personal_description, :checkup_text, :start_date, '9999-12-31', TRUE)
-        """)
+    if not resolved:
+        return
 
-        conn.execute(
-            insert_query,
-            {
-                "member_id": member_id,
-                "committee_name": committee_name,
-                "personal_description": personal_description,
-                "checkup_text": checkup_text,
-                "start_date": start_date,
-            },
-        )
+    engine = DatabaseEngine.get_engine()
+    with engine.begin() as conn:
+        inserted_count, closed_count = _apply_personal_checkups(conn, resolved)
 
-        print(
-            f"✅ Added checkup for committee member {committee_name} (ID: {member_id})"
-        )
-        if end_result.rowcount > 0:
-            print(f"   Ended previous active record and created new one")
-        else:
-            print(f"   Created first checkup record for this member")
+    print(
+        f"✅ Added {inserted_count} committee checkups ({closed_count} previous active records ended)"
+    )
 
 
+@instrumented
 def get_latest_personal_checkup(discord_id: str) -> str:
     """
     Fetch the most recent personal checkup row for a given discord_id.
     Returns a formatted string with the personal description and latest checkup for LLM consumption.
     """
     engine = DatabaseEngine.get_engine()
-    committee_query = text("""
-        SELECT member_id, name
-        FROM silver.committee
-        WHERE discord_id = :discord_id
-        LIMIT 1
-    """)
+    committee = CommitteeDirectory.get_by_discord_id(discord_id)
+    if not committee:
+        return f"No committee member found for discord_id {discord_id}."
+    member_id = committee["member_id"]
+    committee_name = committee["name"]
     with engine.connect() as conn:
-        committee_result = conn.execute(committee_query, {"discord_id": discord_id})
-        committee = committee_result.fetchone()
-        if not committee:
-            return f"No committee member found for discord_id {discord_id}."
-        member_id = committee.member_id
-        committee_name = committee.name
         checkup_query = text("""
             SELECT personal_description, checkup_text, start_date
             FROM silver.committee_personal_checkup
@@ -290,45 +771,93 @@ def get_latest_personal_checkup(discord_id: str) -> str:
         )
 
 
-def get_checkups_for_discord_id(
-    discord_id: str, as_of: Optional[datetime] = None
-) -> dict[str, Any]:
+@instrumented
+def get_checkup_as_of(discord_id: str, as_of: datetime) -> Optional[dict[str, Any]]:
     """
-    Fetch all checkups for a discord_id, or as of a particular datetime if provided.
-    Returns a dictionary with the latest personal description and all relevant checkups with their dates.
+    Fetch the single checkup version that was valid at a point in time.
+    Uses the GiST index on (member_id, valid_period).
+
+    Args:
+        discord_id: Discord ID of the committee member
+        as_of: The point in time to look up
+
+    Returns:
+        Dictionary with the member name, personal description, checkup text and
+        validity bounds, or None if no version was valid at as_of
     """
     engine = DatabaseEngine.get_engine()
-    committee_query = text("""
-        SELECT member_id, name
-        FROM silver.committee
-        WHERE discord_id = :discord_id
+    committee = CommitteeDirectory.get_by_discord_id(discord_id)
+    if not committee:
+        return None
+    query = text("""
+        SELECT personal_description, checkup_text, start_date, end_date
+        FROM silver.committee_personal_checkup
+        WHERE member_id = :member_id
+        AND valid_period @> CAST(:as_of AS TIMESTAMP)
         LIMIT 1
     """)
     with engine.connect() as conn:
-        committee_result = conn.execute(committee_query, {"discord_id": discord_id})
-        committee = committee_result.fetchone()
-        if not committee:
-            return {"error": f"No committee member found for discord_id {discord_id}."}
-        member_id = committee.member_id
-        committee_name = committee.name
+        checkup = conn.execute(
+            query, {"member_id": committee["member_id"], "as_of": as_of}
+        ).first()
+    if not checkup:
+        return None
+    return {
+        "committee_member": committee["name"],
+        "personal_description": checkup.personal_description,
+        "checkup_text": checkup.checkup_text,
+        "start_date": checkup.start_date,
+        "end_date": checkup.end_date,
+    }
+
+
+@instrumented
+def get_checkups_for_discord_id(
+    discord_id: str, as_of: Optional[datetime] = None, limit: Optional[int] = None
+) -> dict[str, Any]:
+    """
+    Fetch the checkups for a discord_id, or as of a particular datetime if provided.
+    Returns a dictionary with the personal description and the relevant checkups with their dates.
+
+    Args:
+        discord_id: Discord ID of the committee member
+        as_of: If given, only versions that started at or before as_of are returned and
+            the personal description is taken from the version valid at as_of
+        limit: If given, return at most this many of the most recent checkups
+    """
+    engine = DatabaseEngine.get_engine()
+    committee = CommitteeDirectory.get_by_discord_id(discord_id)
+    if not committee:
+        return {"error": f"No committee member found for discord_id {discord_id}."}
+    member_id = committee["member_id"]
+    committee_name = committee["name"]
+    with engine.connect() as conn:
         if as_of:
             checkup_query = text("""
-                SELECT personal_description, checkup_text, start_date
+                SELECT
+                    personal_description,
+                    checkup_text,
+                    start_date,
+                    valid_period @> CAST(:as_of AS TIMESTAMP) AS is_valid_at_as_of
                 FROM silver.committee_personal_checkup
                 WHERE member_id = :member_id AND start_date <= :as_of
                 ORDER BY start_date DESC
+                LIMIT :limit
             """)
             checkups = conn.execute(
-                checkup_query, {"member_id": member_id, "as_of": as_of}
+                checkup_query, {"member_id": member_id, "as_of": as_of, "limit": limit}
             ).fetchall()
         else:
             checkup_query = text("""
-                SELECT personal_description, checkup_text, start_date
+                SELECT personal_description, checkup_text, start_date, TRUE AS is_valid_at_as_of
                 FROM silver.committee_personal_checkup
                 WHERE member_id = :member_id
                 ORDER BY start_date DESC
+                LIMIT :limit
             """)
-            checkups = conn.execute(checkup_query, {"member_id": member_id}).fetchall()
+            checkups = conn.execute(
+                checkup_query, {"member_id": member_id, "limit": limit}
+            ).fetchall()
         if not checkups:
             return {
                 "committee_member": committee_name,
@@ -336,10 +865,13 @@ def get_checkups_for_discord_id(
                 "checkups": [],
                 "last_checkup": "(No checkup records found)",
             }
-        # Use the latest personal description (from the first record since we ordered DESC)
+        # Use the latest personal description (from the first record since we ordered DESC),
+        # unless that version had already ended at as_of
         latest_personal_desc = (
-            checkups[0].personal_description or "(No personal description)"
-        )
+            checkups[0].personal_description
+            if checkups[0].is_valid_at_as_of
+            else None
+        ) or "(No personal description)"
         checkup_list = []
         for checkup in checkups:
             date_str = (
@@ -360,26 +892,20 @@ def get_checkups_for_discord_id(
         }
 
 
+@instrumented
 def get_current_personal_description(discord_id: str) -> str:
     """
     Fetch the current personal description for a given discord_id.
     Returns the personal description from the most recent checkup record.
     """
     engine = DatabaseEngine.get_engine()
-    committee_query = text("""
-        SELECT member_id, name
-        FROM silver.committee
-        WHERE discord_id = :discord_id
-        LIMIT 1
-    """)
-    with engine.connect() as conn:
-        committee_result = conn.execute(committee_query, {"discord_id": discord_id})
-        committee = committee_result.fetchone()
-        if not committee:
-            return f"No committee member found for discord_id {discord_id}."
+    committee = CommitteeDirectory.get_by_discord_id(discord_id)
+    if not committee:
+        return f"No committee member found for discord_id {discord_id}."
 
-        member_id = committee.member_id
+    member_id = committee["member_id"]
 
+    with engine.connect() as conn:
         checkup_query = text("""
             SELECT personal_description
             FROM silver.committee_personal_checkup
@@ -395,6 +921,7 @@ def get_current_personal_description(discord_id: str) -> str:
         return checkup.personal_description or "(No personal description)"
 
 
+@instrumented
 def set_personal_description(discord_id: str, personal_description: str) -> None:
     """
     Update the personal_description of the latest (active) row for a given discord_id.
@@ -407,24 +934,14 @@ def set_personal_description(discord_id: str, personal_description: str) -> None
     engine = DatabaseEngine.get_engine()
 
     # First, find the member_id for the given discord_id
-    committee_query = text("""
-        SELECT member_id, name
-        FROM silver.committee
-        WHERE discord_id = :discord_id
-        LIMIT 1
-    """)
-
-    with engine.begin() as conn:
-        # Get committee info
-        committee_result = conn.execute(committee_query, {"discord_id": discord_id})
-        committee = committee_result.fetchone()
-
-        if not committee:
-            raise ValueError(f"No committee member found with discord_id {discord_id}")
+    committee = CommitteeDirectory.get_by_discord_id(discord_id)
+    if not committee:
+        raise ValueError(f"No committee member found with discord_id {discord_id}")
 
-        member_id = committee.member_id
-        committee_name = committee.name
+    member_id = committee["member_id"]
+    committee_name = committee["name"]
 
+    with engine.begin() as conn:
         # Update the personal_description of the current active record
         update_query = text("""
             UPDATE silver.committee_personal_checkup
@@ -449,6 +966,112 @@ def set_personal_description(discord_id: str, personal_description: str) -> None
         print(f"   New description: {personal_description}")
 
 
+@instrumented
+def copy_records(
+    table_name: str, columns: list[str], records: Iterable[Sequence[Any]]
+) -> int:
+    """
+    Bulk load records into a table with COPY FROM STDIN in one transaction.
+
+    None is loaded as NULL (so columns with a DEFAULT must be given explicit values)
+    and every other value is loaded from its str() form.
+
+    Args:
+        table_name: Schema-qualified target table
+        columns: Target columns, in the order of each record's values
+        records: Rows of values to load
+
+    Returns:
+        Number of rows loaded
+    """
+    buffer = io.StringIO()
+    # Unquoted empty fields are NULL in COPY's csv format, quoted ones are ''
+    writer = csv.writer(buffer, quoting=csv.QUOTE_NOTNULL)
+    row_count = 0
+    for record in records:
+        writer.writerow(record)
+        row_count += 1
+    if row_count == 0:
+        return 0
+    buffer.seek(0)
+
+    column_list = ", ".join(columns)
+    copy_sql = f"COPY {table_name} ({column_list}) FROM STDIN WITH (FORMAT csv)"
+    connection = DatabaseEngine.get_engine().raw_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.copy_expert(copy_sql, buffer)
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        connection.close()
+    return row_count
+
+
+@instrumented
+def maintain_bus_event_partitions(
+    months_ahead: int = 2, retention_months: int = 6, keep_detached: bool = False
+) -> dict[str, int]:
+    """
+    Create upcoming monthly partitions of silver.llmgine_bus_events and roll up
+    partitions older than the retention window into daily per-class counts.
+    See brain/silver/src/DDL/llmgine_bus_events.sql.
+
+    Args:
+        months_ahead: Number of future monthly partitions to keep created
+        retention_months: Number of past months to keep as raw events
+        keep_detached: Detach expired partitions but do not drop them
+
+    Returns:
+        Dictionary with the number of partitions created and rolled up
+    """
+    engine = DatabaseEngine.get_engine()
+    # Separate transactions, so a failed rollup never undoes the new partitions
+    with engine.begin() as conn:
+        # Moving default-partition rows and rolling up a month of events can
+        # exceed the per-query timeout
+        conn.execute(text("SET LOCAL statement_timeout = 0"))
+        created = conn.execute(
+            text("SELECT silver.ensure_llmgine_bus_events_partitions(:months_ahead)"),
+            {"months_ahead": months_ahead},
+        ).scalar_one()
+    with engine.begin() as conn:
+        conn.execute(text("SET LOCAL statement_timeout = 0"))
+        rolled_up = conn.execute(
+            text(
+                "SELECT silver.rollup_llmgine_bus_events("
+                ":retention_months, :keep_detached)"
+            ),
+            {"retention_months": retention_months, "keep_detached": keep_detached},
+        ).scalar_one()
+    return {"created": created, "rolled_up": rolled_up}
+
+
+# Gold materialized views, in dependency order
+GOLD_MATERIALIZED_VIEWS: list[str] = ["gold.users_base"]
+
+
+@instrumented
+def refresh_gold_views(concurrently: bool = True) -> None:
+    """
+    Refresh the gold materialized views from silver.
+
+    Args:
+        concurrently: Refresh without blocking readers. Requires the unique
+            indexes defined in brain/gold/src/DDL and an already populated view.
+    """
+    engine = DatabaseEngine.get_engine()
+    mode = "CONCURRENTLY " if concurrently else ""
+    with engine.begin() as conn:
+        # A refresh rebuilds the whole view and can exceed the per-query timeout
+        conn.execute(text("SET LOCAL statement_timeout = 0"))
+        for view_name in GOLD_MATERIALIZED_VIEWS:
+            conn.execute(text(f"REFRESH MATERIALIZED VIEW {mode}{view_name}"))
+    print(f"✅ Refreshed {', '.join(GOLD_MATERIALIZED_VIEWS)}")
+
+
 def get_committee_member_by_notion_id(notion_id: str) -> Optional[dict[str, Any]]:
     """
     Retrieve a committee member by their Notion ID.
@@ -459,17 +1082,7 @@ def get_committee_member_by_notion_id(notion_id: str) -> Optional[dict[str, Any]
     Returns:
         Dictionary containing member data or None if not found
     """
-    engine = DatabaseEngine.get_engine()
-    query = text("""
-        SELECT member_id, name, notion_id, discord_id, discord_dm_channel_id, ingestion_timestamp
-        FROM silver.committee
-        WHERE notion_id = :notion_id
-        LIMIT 1
-    """)
-    with engine.connect() as conn:
-        result = conn.execute(query, {"notion_id": notion_id})
-        member = result.mappings().first()
-        return dict(member) if member else None
+    return CommitteeDirectory.get_by_notion_id(notion_id)
 
 
 def get_committee_member_by_discord_id(discord_id: str) -> Optional[dict[str, Any]]:
@@ -482,17 +1095,7 @@ def get_committee_member_by_discord_id(discord_id: str) -> Optional[dict[str, An
     Returns:
         Dictionary containing member data or None if not found
     """
-    engine = DatabaseEngine.get_engine()
-    query = text("""
-        SELECT member_id, name, notion_id, discord_id, discord_dm_channel_id, ingestion_timestamp
-        FROM silver.committee
-        WHERE discord_id = :discord_id
-        LIMIT 1
-    """)
-    with engine.connect() as conn:
-        result = conn.execute(query, {"discord_id": discord_id})
-        member = result.mappings().first()
-        return dict(member) if member else None
+    return CommitteeDirectory.get_by_discord_id(discord_id)
 
 
 def get_committee_member_by_discord_dm_channel_id(
@@ -507,17 +1110,7 @@ def get_committee_member_by_discord_dm_channel_id(
     Returns:
         Dictionary containing member data or None if not found
     """
-    engine = DatabaseEngine.get_engine()
-    query = text("""
-        SELECT member_id, name, notion_id, discord_id, discord_dm_channel_id, ingestion_timestamp
-        FROM silver.committee
-        WHERE discord_dm_channel_id = :discord_dm_channel_id
-        LIMIT 1
-    """)
-    with engine.connect() as conn:
-        result = conn.execute(query, {"discord_dm_channel_id": discord_dm_channel_id})
-        member = result.mappings().first()
-        return dict(member) if member else None
+    return CommitteeDirectory.get_by_discord_dm_channel_id(discord_dm_channel_id)
 
 
 def main():
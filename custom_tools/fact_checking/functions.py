@@ -3,10 +3,10 @@ from typing import List
 from llmgine.bus.bus import MessageBus
 from llmgine.ui.cli.components import SelectPromptCommand
 from custom_tools.brain.postgres.postgres import (
-    DatabaseEngine,
     set_user_fact,
     get_user_fact,
     delete_fact,
+    search_user_facts,
 )
 
 
@@ -21,8 +21,7 @@ def create_fact(discord_id: str, fact: str) -> str:
         A message indicating that the fact was created or an error message
     """
     try:
-        db = DatabaseEngine.get_engine()
-        set_user_fact(discord_id, fact, db)
+        set_user_fact(discord_id, fact)
         return f"Created fact: {fact}"
     except Exception as e:
         return f"Error creating fact: {e}"
@@ -39,8 +38,7 @@ def delete_facts(discord_id: str, fact_id: str) -> str:
         A message indicating that the facts were deleted
     """
     try:
-        db = DatabaseEngine.get_engine()
-        delete_fact(discord_id, fact_id, db)
+        delete_fact(discord_id, fact_id)
         return f"Deleted fact with ID: {fact_id}"
     except Exception as e:
         return f"Error deleting facts: {e}"
@@ -57,8 +55,7 @@ def get_all_facts(discord_id: str) -> str:
         A message indicating that the fact was retrieved
     """
 
-    db = DatabaseEngine.get_engine()
-    facts = get_user_fact(discord_id, db)
+    facts = get_user_fact(discord_id)
 
     parsed_facts = []
     for fact in facts:
@@ -72,6 +69,31 @@ def get_all_facts(discord_id: str) -> str:
         return f"All facts are: {parsed_facts}"
 
 
+def get_similar_facts(discord_id: str, keywords: str) -> str:
+    """This function gets the facts most relevant to a couple of keywords.
+
+    Args:
+        discord_id: The discord id of the user to get the similar facts for
+        keywords: A couple of keywords that are most representative of the fact, separated by spaces
+
+    Returns:
+        The most relevant facts with their ids, or a message that none were found
+    """
+
+    facts = search_user_facts(discord_id, keywords.split(), top_k=10)
+
+    parsed_facts = []
+    for fact in facts:
+        parsed_facts.append(
+            {"fact_id": fact["fact_id"], "fact_text": fact["fact_text"]}
+        )
+
+    if len(parsed_facts) == 0:
+        return "No similar facts found"
+    else:
+        return f"Similar facts are: {parsed_facts}"
+
+
 # Message bus and session id are hidden from the llm, we will insert them manually
 async def send_to_judge(
     discord_id: str,
@@ -165,7 +187,7 @@ async def deletion_confirmation(
 
 
 def main():
-    print(get_similar_facts("774065995508744232", ["color", "enjoy"]))
+    print(get_similar_facts("774065995508744232", "color enjoy"))
 
 
 if __name__ == "__main__":
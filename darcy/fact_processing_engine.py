@@ -13,6 +13,7 @@ from dataclasses import dataclass
 from typing import Optional
 import uuid
 import json
+import re
 
 from llmgine.llm.engine.engine import Engine
 from llmgine.llm.models.model import Model
@@ -29,14 +30,17 @@ from custom_tools.fact_checking.functions import (
     create_fact,
     send_to_judge,
     deletion_confirmation,
-    get_all_facts,
+    get_similar_facts,
 )
 
 CREATE_FACT_TOKEN = "<CREATE_FACT>"
 DELETE_FACT_TOKEN = "<DELETE_FACT>"
+# Words shorter than this ("I", "a", "is") would fuzzy-match nearly every fact
+MIN_KEYWORD_LENGTH = 3
 
 SYSTEM_PROMPT = (
-    f"You are a fact processing engine. You will receive a new fact to create or delete, and you will also receive all facts. "
+    f"You are a fact processing engine. You will receive a new fact to create or delete, and you will also receive the existing facts most similar to it. "
+    f'If you need to check other existing facts, call the "get_similar_facts" tool with a couple of keywords. '
     f"Your task:"
     f"1. Choose the facts that are similar and contradictory to the new fact."
     f'2. If requested for creation and there are similar or contradictory facts, call the "send_to_judge" tool.'
@@ -45,18 +49,18 @@ SYSTEM_PROMPT = (
     f'5. If requested for deletion and there are no similar or contradictory facts, say something like "Cannot delete fact because there are no similar or contradictory facts".\n'
     f"Examples:"
     f"Example 1:"
-    f'Input: "<CREATE_FACT> I love cheese. All facts: I enjoy eating cheese. I love cheese. I hate cheese."'
+    f'Input: "<CREATE_FACT> I love cheese. Similar facts: I enjoy eating cheese. I love cheese. I hate cheese."'
     f'Action: "Tool call: send_to_judge"'
     f"Example 2:"
-    f'Input: "<CREATE_FACT> I love cheese. All facts: I enjoy eating beef."'
+    f'Input: "<CREATE_FACT> I love cheese. Similar facts: I enjoy eating beef."'
     f'Action: "Tool call: create_fact"'
     f'Output: "Created fact: I love cheese."'
     f"Example 3:"
-    f'Input: "<DELETE_FACT> I love cheese. All facts: I enjoy eating cheese. I love cheese. I hate cheese."'
+    f'Input: "<DELETE_FACT> I love cheese. Similar facts: I enjoy eating cheese. I love cheese. I hate cheese."'
     f'Action: "Tool call: deletion_confirmation"'
     f'Output: "Confirmation: I love cheese."'
     f"Example 4:"
-    f'Input: "<DELETE_FACT> I love cheese. All facts: I enjoy eating beef."'
+    f'Input: "<DELETE_FACT> I love cheese. Similar facts: I enjoy eating beef."'
     f'Action: "Tool call: deletion_confirmation"'
     f'Output: "Cannot delete fact because there are no similar or contradictory facts".\n'
 )
@@ -128,7 +132,7 @@ class FactProcessingEngine(Engine):
         """This function parses the prompt into a content string.
         User details are appending to the prompt.
         If the prompt contains a CREATE_FACT_TOKEN or DELETE_FACT_TOKEN,
-        then all facts relating to the user are appended to the prompt.
+        then the facts of the user most similar to the new fact are appended to the prompt.
 
         Args:
             prompt: The prompt to parse
@@ -137,7 +141,14 @@ class FactProcessingEngine(Engine):
         discord_id = "774065995508744232"
         content += f"My discord id is {discord_id}. {prompt}"
         if CREATE_FACT_TOKEN in prompt or DELETE_FACT_TOKEN in prompt:
-            content += get_all_facts(discord_id)
+            # Only the facts related to the new one, not every fact of the user
+            fact = prompt.replace(CREATE_FACT_TOKEN, "").replace(DELETE_FACT_TOKEN, "")
+            keywords = [
+                word
+                for word in re.findall(r"\w+", fact)
+                if len(word) >= MIN_KEYWORD_LENGTH
+            ]
+            content += " " + get_similar_facts(discord_id, " ".join(keywords))
 
         return content
 
@@ -295,6 +306,7 @@ async def main():
     await engine.register_tool(create_fact)
     await engine.register_tool(send_to_judge)
     await engine.register_tool(deletion_confirmation)
+    await engine.register_tool(get_similar_facts)
     await cli.main()
 
 
@@ -18,7 +18,7 @@ from custom_tools.brain.notion.data import (
     get_user_from_notion_id,
     notion_user_id_type,
 )
-from custom_tools.brain.notion.notion_functions import (
+from custom_tools.brain.notion.async_notion_functions import (
     create_task,
     get_active_projects,
     get_active_tasks,
@@ -11,6 +11,7 @@ The bot is started here.
 
 import asyncio
 import logging
+from typing import Optional
 
 import discord
 from discord.ext import commands
@@ -22,6 +23,15 @@ from engine_manager import EngineManager
 from message_processor import MessageProcessor
 from session_manager import SessionManager
 
+# engine_manager puts the project root on sys.path
+from custom_tools.brain.notion.task_mirror import TaskMirror
+from custom_tools.brain.postgres.bus_event_sink import BusEventSink
+from darcy.notion_crud_engine_v3 import (
+    NotionCRUDEnginePromptResponseEvent,
+    NotionCRUDEngineStatusEvent,
+    NotionCRUDEngineToolResultEvent,
+)
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 
@@ -101,12 +111,33 @@ class DarcyBot:
         bus: MessageBus = MessageBus()
         await bus.start()
 
+        # Persist engine events in batches without slowing down message handling
+        event_sink: Optional[BusEventSink] = None
+        if self.config.persist_bus_events:
+            event_sink = BusEventSink()
+            await event_sink.start()
+            event_sink.attach(
+                bus,
+                [
+                    NotionCRUDEngineStatusEvent,
+                    NotionCRUDEnginePromptResponseEvent,
+                    NotionCRUDEngineToolResultEvent,
+                ],
+            )
+
+        # Answer task/project reads from a local mirror of Notion
+        if self.config.notion_mirror_path:
+            TaskMirror.start(self.config.notion_mirror_path)
+
         try:
             # Run the bot
             await self.bot.start(self.config.bot_key)
         finally:
             # Ensure the bus is stopped when the application ends
             await bus.stop()
+            if event_sink is not None:
+                await event_sink.stop()
+            TaskMirror.stop()
 
 
 async def main() -> None:
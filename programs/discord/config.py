@@ -8,6 +8,8 @@ This module contains the configuration for Darcy:
 - Maximum response length
 - Discord bot key
 - Bot ID
+- Bus event persistence
+- Notion task mirror
 
 It also loads Darcy's key from the environment variables.
 """
@@ -37,10 +39,22 @@ class DiscordBotConfig(ApplicationConfig):
     bot_key: str = ""
     bot_id: int = os.getenv("BOT_ID")
 
+    # Persist bus events to silver.llmgine_bus_events
+    persist_bus_events: bool = False
+
+    # SQLite file mirroring the Notion tasks/projects databases; empty disables it
+    notion_mirror_path: str = ""
+
     @classmethod
     def load_from_env(cls) -> "DiscordBotConfig":
         """Load configuration from environment variables."""
         dotenv.load_dotenv(override=True)
         config = cls()
         config.bot_key = os.getenv("BOT_KEY")
+        config.persist_bus_events = os.getenv("PERSIST_BUS_EVENTS", "").lower() in (
+            "1",
+            "true",
+            "yes",
+        )
+        config.notion_mirror_path = os.getenv("NOTION_MIRROR_PATH", "")
         return config
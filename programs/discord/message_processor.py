@@ -12,7 +12,7 @@ from typing import Optional
 
 import discord
 
-from custom_tools.general.functions import get_all_facts, get_user_info
+from custom_tools.brain.postgres.async_postgres import get_author_context
 from custom_tools.brain.notion.data import (
     UserData,
     discord_user_id_type,
@@ -42,7 +42,7 @@ class MessageProcessor:
 
         # Process user mentions
         user_mentions = self._process_mentions(message)
-        author_payload = self._create_author_payload(message)
+        author_payload = await self._create_author_payload(message)
         chat_history = await self._get_chat_history(message)
         reply_payload = await self._process_reply(message)
 
@@ -69,22 +69,19 @@ class MessageProcessor:
                 mentions_payload.append({discord_id: "Unknown Notion ID"})
         return str(mentions_payload)
 
-    def _create_author_payload(self, message: discord.Message) -> str:
+    async def _create_author_payload(self, message: discord.Message) -> str:
         """Create payload for the message author."""
         author_discord_id = discord_user_id_type(str(message.author.id))
         author_data: UserData | None = get_user_from_discord_id(author_discord_id)
         author_notion_id = "Unknown Notion ID"
         if author_data:
             author_notion_id = author_data.notion_id
-        author_info = get_user_info(author_discord_id)
-        author_facts = get_all_facts(author_discord_id)
+        author_context = await get_author_context(author_discord_id)
         return (
-            "The Author of this message is:"
+            "The Author of this message is: "
             + str({author_discord_id: author_notion_id})
-            + "Some info about the author are: "
-            + author_info
-            + "Some facts about the author are: "
-            + author_facts
+            + "\n"
+            + author_context
         )
 
     async def _get_chat_history(self, message: discord.Message) -> str:
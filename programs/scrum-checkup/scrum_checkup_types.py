@@ -32,7 +32,7 @@ from llmgine.prompts.prompts import get_prompt
 
 from custom_types.discord import DiscordChannelID, DiscordUserID
 from custom_types.notion import NotionUserID
-from custom_tools.brain.postgres.postgres import (
+from custom_tools.brain.postgres.async_postgres import (
     get_committee_member_by_discord_id,
     get_checkups_for_discord_id,
     set_committee_personal_checkup
@@ -99,7 +99,7 @@ async def check_up_event_handler(event: CheckUpEvent):
 
     print(f"Checking up on user {event.user_discord_id}")
 
-    user_row = get_committee_member_by_discord_id(event.user_discord_id)
+    user_row = await get_committee_member_by_discord_id(event.user_discord_id)
 
     if user_row is None:
         raise ValueError(
@@ -111,7 +111,8 @@ async def check_up_event_handler(event: CheckUpEvent):
             f"User with discord_id {event.user_discord_id} has no discord_dm_channel_id set"
         )
 
-    user_context = get_checkups_for_discord_id(event.user_discord_id)
+    # Only the latest checkup goes into the prompt
+    user_context = await get_checkups_for_discord_id(event.user_discord_id, limit=1)
 
     tasks = await fetch_user_tasks(user_row["notion_id"])
 
@@ -154,7 +155,7 @@ async def check_up_finished_event_handler(event: CheckUpFinishedEvent):
     await useScrumUpdateEngine(context)
 
     # Update the personal checkup in the database
-    set_committee_personal_checkup(
+    await set_committee_personal_checkup(
         context.discord_id, str(context.conversation), datetime.now()
     )
 
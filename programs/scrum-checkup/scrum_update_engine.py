@@ -17,10 +17,14 @@ from llmgine.llm.tools.toolCall import ToolCall
 from llmgine.llm import SessionID
 from llmgine.llm.providers.response import LLMResponse
 
-from custom_tools.brain.postgres.postgres import get_committee_member_by_discord_id
+from custom_tools.brain.postgres.async_postgres import get_committee_member_by_discord_id
 from custom_types.discord import DiscordChannelID, DiscordUserID
 from custom_types.notion import NotionUserID
-from custom_tools.brain.notion.notion_functions import update_task, update_task_progress
+from custom_tools.brain.notion.async_notion_functions import (
+    update_task,
+    update_task_progress,
+    update_tasks_bulk,
+)
 from scrum_checkup_types import CheckUpEventContext
 
 
@@ -178,7 +182,7 @@ class ScrumUpdateEngine:
 
 
 async def useScrumUpdateEngine(checkup_context: CheckUpEventContext):
-    user_row = get_committee_member_by_discord_id(checkup_context.discord_id)
+    user_row = await get_committee_member_by_discord_id(checkup_context.discord_id)
     if user_row is None:
         raise ValueError(f"User with discord_id {checkup_context.discord_id} not found in database")
     user_name = user_row["name"]
@@ -187,6 +191,7 @@ async def useScrumUpdateEngine(checkup_context: CheckUpEventContext):
         system_prompt=f"""You will be given a conversation between {user_name} and a scrum master. You will then schedule the next scrum time based on the conversation. The current datetime is {datetime.now()}.
         For tasks mentioned in the conversation, you will need to update the task status when necessary. ie. if the user says "I have finished task 1", you will need to update the task status to "Done".
         For every task mentioned in the conversation, you will need to update the task progress using the update_task_progress tool.
+        When more than one task needs updating, make a single update_tasks_bulk call with every task's changes and progress instead.
         """,
         session_id=SessionID(str(uuid.uuid4())),
         user_discord_id=checkup_context.discord_id,
@@ -194,6 +199,7 @@ async def useScrumUpdateEngine(checkup_context: CheckUpEventContext):
     await engine.tool_manager.register_tool(engine.schedule_next_scrum)
     await engine.tool_manager.register_tool(update_task)
     await engine.tool_manager.register_tool(update_task_progress)
+    await engine.tool_manager.register_tool(update_tasks_bulk)
     await engine.handle_command(
         ScrumUpdateCommand(prompt=str(checkup_context.conversation))
     )